@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""Measure how long jackbot takes to start, per phase, against local stand-ins for Slack and fishery.
+
+Every measurement runs in a fresh interpreter so imports are timed cold. The parent process
+starts the stub server, writes a config pointing at it and runs one probe per target and run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ACCOUNT = 'bench'
+MANAGE = 'manage'
+
+
+def probe(target: str):
+    """Time the startup phases of one target in this (fresh) interpreter and print them as JSON."""
+    timings = {}
+    started = time.perf_counter()
+
+    def lap(phase):
+        nonlocal started
+        now = time.perf_counter()
+        timings[phase] = timings.get(phase, 0.0) + now - started
+        started = now
+
+    # pylint: disable=import-outside-toplevel,unused-import
+    import slack_sdk  # noqa: F401
+    lap('import_slack_sdk')
+    import requests  # noqa: F401
+    lap('import_requests')
+    from jackbox import Jackbox
+    from jackbox.core import registry
+    lap('import_jackbox')
+
+    # Time channel resolution separately from the rest of the setup
+    resolve = Jackbox._resolve_channel_id  # pylint: disable=protected-access
+
+    def timed_resolve(self, channel):
+        lap('setup')
+        try:
+            return resolve(self, channel)
+        finally:
+            lap('channel')
+    Jackbox._resolve_channel_id = timed_resolve  # pylint: disable=protected-access
+
+    if target == MANAGE:
+        config = Jackbox.load_config(ACCOUNT)
+        lap('config')
+        instance = Jackbox.__new__(Jackbox)
+        instance.dry_run = False
+        instance.api_account = ACCOUNT
+        instance.config = config
+        instance._connect_slack(config)  # pylint: disable=protected-access
+        lap('setup')
+        instance.get_bot_messages(limit=50)
+        lap('history')
+    else:
+        game_class = registry.load(registry.find(target))
+        lap('import_game')
+        Jackbox.load_config(ACCOUNT)
+        lap('config')
+        game = game_class(game_id='bench0000000000000000000000000001', api_account=ACCOUNT)
+        lap('setup')
+        Jackbox.process_game(game)
+        lap('artifact')
+    print(json.dumps(timings))
+
+
+def run_probe(target: str, env: dict) -> dict:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--probe', target],
+        env=env, capture_output=True, text=True, check=False,
+    )
+    total = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Probe for {target} failed:\n{result.stderr}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    # Interpreter start-up and shutdown are whatever the probe itself did not measure
+    timings['interpreter'] = total - sum(timings.values())
+    timings['total'] = total
+    return timings
+
+
+def summarize(samples: list) -> dict:
+    phases = {}
+    for sample in samples:
+        for phase, seconds in sample.items():
+            phases.setdefault(phase, []).append(seconds * 1000)
+    return {
+        phase: {
+            'median_ms': round(statistics.median(values), 2),
+            'min_ms': round(min(values), 2),
+            'max_ms': round(max(values), 2),
+        }
+        for phase, values in phases.items()
+    }
+
+
+def measure(targets: list, runs: int, warm: bool) -> dict:
+    """Run the probes of every target against a stub server. Returns {target: summarized timings}."""
+    from bin.stubs import StubServer  # pylint: disable=import-outside-toplevel
+
+    server = StubServer().start()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='jackbot-bench-') as work_dir:
+        config_file = os.path.join(work_dir, 'config.json')
+        env = dict(os.environ, JACKBOT_CONFIG=config_file)
+        env['PYTHONPATH'] = os.pathsep.join(
+            filter(None, [os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env.get('PYTHONPATH')])
+        )
+        for target in targets:
+            samples = []
+            for run in range(runs + (1 if warm else 0)):
+                cache = os.path.join(work_dir, 'cache' if warm else f"cache-{target}-{run}")
+                with open(config_file, 'w', encoding='utf-8') as file:
+                    file.write(json.dumps({ACCOUNT: server.config(cache_dir=cache)}))
+                timings = run_probe(target, env)
+                if warm and run == 0:
+                    # Only primes the caches
+                    continue
+                samples.append(timings)
+            results[target] = summarize(samples)
+            print(f"{target:16} total {results[target]['total']['median_ms']:8.1f} ms  " + "  ".join(
+                f"{phase} {stats['median_ms']:.1f}"
+                for phase, stats in results[target].items() if phase != 'total'
+            ))
+    server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark jackbot start-up time per phase')
+    parser.add_argument('-g', '--game', dest='games', action='append',
+                        help=f'Game to benchmark, or {MANAGE} for --manage-messages. Default: all games and {MANAGE}')
+    parser.add_argument('-n', '--runs', type=int, default=5, help='Runs per target. Default 5')
+    parser.add_argument('--warm', action='store_true',
+                        help='Keep the channel index and artifact store between runs instead of starting cold')
+    parser.add_argument('-o', '--output', default='jackbot-bench.json', help='Result file. Default jackbot-bench.json')
+    parser.add_argument('--probe', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe(args.probe)
+        return
+
+    from jackbox.core import registry  # pylint: disable=import-outside-toplevel
+
+    results = measure(args.games or [*registry.names(), MANAGE], args.runs, args.warm)
+    report = {
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': args.runs,
+        'warm': args.warm,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        file.write(json.dumps(report, indent=2))
+    print(f"INFO: Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
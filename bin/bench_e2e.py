@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+"""End-to-end benchmark: replay game artifacts through the real process_game implementations.
+
+Fishery, S3 and Slack are replaced by a local stub server with configurable latency and
+bandwidth. Recorded artifacts are read from the test fixtures directory; every other game is
+given a synthetic artifact of a similar size. Each pipeline mode runs in its own process so
+its peak memory is measured separately.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ACCOUNT = 'bench'
+RESULT_MARKER = 'BENCH_RESULT '
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test')
+# Everyday's process_game only dumps the artifact, so it cannot be replayed
+SKIPPED_GAMES = ('everyday',)
+
+# Settings applied on top of the stub config for each pipeline mode
+MODES = {
+    'serial': {
+        'jobs': 1,
+        'config': {
+            'fetch_workers': 1,
+            'render_workers': 0,
+            'slack_concurrency': {'tier2': 1, 'tier3': 1, 'tier4': 1},
+            'slack_upload_batch_size': 1,
+        },
+    },
+    'concurrent': {
+        'jobs': 3,
+        'config': {},
+    },
+}
+
+
+def _lines(rng, count: int, size: int = 300) -> list:
+    return [
+        {
+            'color': f"#{rng.randrange(0x1000000):06x}",
+            'thickness': rng.choice((2, 4, 8)),
+            'points': [{'x': rng.uniform(0, size), 'y': rng.uniform(0, size)} for _ in range(rng.randrange(1, 40))],
+        }
+        for _ in range(count)
+    ]
+
+
+def _player(rng, players: int = 8) -> dict:
+    return {'name': f"PLAYER{rng.randrange(players)}", 'score': rng.randrange(5000)}
+
+
+def synthetic_artifact(game: str, seed: int) -> dict:  # pylint: disable=too-many-return-statements
+    """Return an artifact shaped like the ones fishery serves for a game."""
+    rng = random.Random(f"{game}-{seed}")
+    if game in ('quiplash2', 'quiplash3'):
+        matchups = [
+            {
+                'question': {'prompt': f"Prompt number {index} of game {seed}"},
+                **{side: {'player': _player(rng), 'answer': f"answer {side} {index}", 'percent': rng.randrange(101),
+                          'quiplash': rng.random() < 0.2} for side in ('left', 'right')},
+            }
+            for index in range(16)
+        ]
+        return {'matchups': matchups} if game == 'quiplash2' else {'blob': {'matchups': matchups}}
+    if game in ('brk', 'bracketeering'):
+        return {'bracketData': {
+            str(bracket): {'content': {'prompt': {'text': f"Bracket {bracket} prompt"}}, 'matchups': [{}] * 7}
+            for bracket in range(3)
+        }}
+    if game in ('overdrawn', 'civicdoodle'):
+        return {'rounds': [{'titleVotes': {'winningTitle': f"Round {index} title"}} for index in range(6)]}
+    if game == 'range':
+        players = [{'sessionId': index, 'name': f"PLAYER{index}"} for index in range(6)]
+        return {'blob': {'players': players, 'roundData': [
+            {
+                'index': round_index,
+                'prompts': [{'id': 0, 'rangeType': {'values': [{'guessingText': f"value {i}"} for i in range(5)]}}],
+                'responses': [
+                    {'authorSessionId': player['sessionId'], 'promptId': 0, 'targetValueIndex': rng.randrange(5)}
+                    for player in players
+                ],
+            }
+            for round_index in range(3)
+        ]}}
+    if game == 'drawful':
+        portraits = [{'player': {'name': f"PLAYER{index}"}, 'lines': _lines(rng, 20)} for index in range(6)]
+        drawings = [
+            {
+                'player': {'name': f"PLAYER{index % 6}"},
+                'title': {'text': f"Drawing {index}"},
+                'lines': _lines(rng, 40),
+                'lies': [{'player': _player(rng, 6), 'text': f"lie {lie}"} for lie in range(4)],
+            }
+            for index in range(12)
+        ]
+        return {'blob': {'playerPortraits': portraits, 'drawings': drawings}}
+    if game in ('teeko', 'teeko2'):
+        return {'shirts': [
+            {
+                'drawing': {'lines': _lines(rng, 40), 'background': '#FFFFFF', 'artist': _player(rng)},
+                'slogan': {'slogan': f"Slogan {index}", 'author': _player(rng)},
+                'designer': _player(rng),
+                'wins': rng.randrange(4),
+            }
+            for index in range(12)
+        ]}
+    if game == 'worldchampions':
+        def drawing(name):
+            return {'player': _player(rng), 'name': name, 'lines': _lines(rng, 30, 400),
+                    'size': {'width': 400, 'height': 400}, 'voteData': {'isWinner': rng.random() < 0.5}}
+        return {'blob': {'matchups': [
+            {'fullTitle': f"The champion of {index}", 'title': f"Champion {index}",
+             'challenger': drawing(f"challenger{index}"), 'champion': drawing(f"champion{index}")}
+            for index in range(14)
+        ]}}
+    raise ValueError(f"No synthetic artifact for {game}")
+
+
+def build_workload(games: list, repeat: int, fixtures: str):
+    """Return (urls, artifacts) for repeat copies of every game, preferring recorded fixtures."""
+    # pylint: disable=import-outside-toplevel
+    from jackbox.core import registry
+
+    categories = {game: category for category, game in registry.CATEGORIES.items()}
+    urls = []
+    artifacts = {}
+    for name in games:
+        if name not in categories:
+            raise ValueError(f"{name} has no artifact category of its own, expected one of {', '.join(categories)}")
+        category = categories[name]
+        fixture = os.path.join(fixtures, f"{name}.json")
+        recorded = None
+        if os.path.exists(fixture):
+            with open(fixture, 'rb') as file:
+                recorded = file.read()
+        for copy in range(repeat):
+            game_id = f"{name}{copy:04d}".ljust(32, '0')
+            artifacts[(category, game_id)] = recorded or json.dumps(synthetic_artifact(name, copy)).encode()
+            urls.append(f"https://games.jackbox.tv/artifact/{category}/{game_id}")
+    return urls, artifacts
+
+
+class StageRecorder:
+    """Collect the latency of every call to the instrumented pipeline stages."""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, owner, attribute: str, stage: str):
+        func = getattr(owner, attribute)
+        recorder = self
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.add(stage, time.perf_counter() - started)
+        setattr(owner, attribute, timed)
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def percentiles(self) -> dict:
+        result = {}
+        for stage, values in self.samples.items():
+            values = sorted(values)
+            quantiles = statistics.quantiles(values, n=100, method='inclusive') if len(values) > 1 else values * 99
+            result[stage] = {
+                'count': len(values),
+                'p50_ms': round(quantiles[49] * 1000, 2),
+                'p90_ms': round(quantiles[89] * 1000, 2),
+                'p99_ms': round(quantiles[98] * 1000, 2),
+                'max_ms': round(values[-1] * 1000, 2),
+            }
+        return result
+
+
+def descendant_peak_rss_mb() -> float:
+    """Return the summed peak RSS of every process started (directly or not) by this one.
+
+    Render workers are started by a forkserver, so they are not reported by RUSAGE_CHILDREN.
+    Reads /proc and returns 0 where it is not available.
+    """
+    parents = {}
+    peaks = {}
+    try:
+        pids = [int(name) for name in os.listdir('/proc') if name.isdigit()]
+    except OSError:
+        return 0.0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status", encoding='utf-8') as file:
+                fields = dict(line.split(':', 1) for line in file.read().splitlines() if ':' in line)
+        except OSError:
+            continue
+        parents[pid] = int(fields['PPid'])
+        if 'VmHWM' in fields:
+            peaks[pid] = int(fields['VmHWM'].split()[0])
+
+    def descends(pid):
+        while pid in parents and pid != 1:
+            pid = parents[pid]
+            if pid == os.getpid():
+                return True
+        return False
+    return round(sum(peak for pid, peak in peaks.items() if descends(pid)) / 1024, 1)
+
+
+def stage_recorder() -> StageRecorder:
+    """Return a StageRecorder timing every stage of the pipeline."""
+    # pylint: disable=import-outside-toplevel
+    from jackbox import Jackbox
+    from jackbox.core import slack
+
+    recorder = StageRecorder()
+    recorder.wrap(Jackbox, 'process_game', 'artifact')
+    recorder.wrap(Jackbox, 'generate_images', 'image')
+    recorder.wrap(Jackbox, 'render_drawings', 'render')
+    recorder.wrap(slack.FileUploader, '_upload', 'upload')
+    recorder.wrap(Jackbox, 'send_queued_messages', 'send')
+    return recorder
+
+
+def run_mode(mode: str, urls: list):
+    """Process every URL with the pipeline settings of a mode and print the measurements."""
+    # pylint: disable=import-outside-toplevel
+    from jackbox.core.render import close_render_pools
+    from bin.jackbot import run_game
+
+    recorder = stage_recorder()
+    args = argparse.Namespace(api_account=ACCOUNT, dry_run=False, offline=False, repost=False)
+
+    def timed_game(url):
+        started = time.perf_counter()
+        result = run_game(url, args)
+        recorder.add('game', time.perf_counter() - started)
+        return result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=MODES[mode]['jobs']) as executor:
+        results = list(executor.map(timed_game, urls))
+    wall = time.perf_counter() - started
+    children_rss = descendant_peak_rss_mb()
+    close_render_pools()
+
+    failures = [f"{url}: {error}" for url, (_, status, error) in zip(urls, results) if status != 'ok']
+    images = len(recorder.samples.get('upload', []))
+    print(RESULT_MARKER + json.dumps({
+        'mode': mode,
+        'games': len(urls),
+        'failures': failures,
+        'wall_s': round(wall, 3),
+        'games_per_min': round(len(urls) / wall * 60, 2),
+        'images': images,
+        'images_per_s': round(images / wall, 2),
+        'stages': recorder.percentiles(),
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'peak_rss_children_mb': children_rss,
+    }))
+
+
+def mode_config(server, mode: str, args, work_dir: str) -> dict:
+    """Return the account config of a mode, pointing at the stub server."""
+    config = server.config(cache_dir=os.path.join(work_dir, f"cache-{mode}"), **MODES[mode]['config'])
+    if not args.paced:
+        config['slack_rate_limits'] = dict.fromkeys(('tier1', 'tier2', 'tier3', 'tier4', 'special'), 1000000)
+    if args.renderer:
+        config['renderer'] = args.renderer
+    if args.render_workers is not None and mode != 'serial':
+        config['render_workers'] = args.render_workers
+    return config
+
+
+def run_mode_process(mode: str, config: dict, urls_file: str, work_dir: str) -> dict:
+    """Run a mode in a fresh interpreter with the given config. Returns the measurements it printed."""
+    config_file = os.path.join(work_dir, f"config-{mode}.json")
+    with open(config_file, 'w', encoding='utf-8') as file:
+        file.write(json.dumps({ACCOUNT: config}))
+    env = dict(os.environ, JACKBOT_CONFIG=config_file)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env.get('PYTHONPATH')])
+    )
+    with tempfile.TemporaryDirectory(prefix='jackbot-bench-run-') as run_dir:
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run-mode', mode, '--urls', urls_file],
+            env=env, cwd=run_dir, capture_output=True, text=True, check=False,
+        )
+    lines = [line for line in process.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+    if process.returncode != 0 or not lines:
+        sys.exit(f"ERROR: {mode} run failed:\n{process.stdout[-2000:]}\n{process.stderr[-2000:]}")
+    return json.loads(lines[-1][len(RESULT_MARKER):])
+
+
+def print_result(mode: str, result: dict):
+    print(f"\n{mode}: {result['games']} games in {result['wall_s']:.2f}s, "
+          f"{result['games_per_min']:.1f} games/min, {result['images_per_s']:.1f} images/s, "
+          f"peak RSS {result['peak_rss_mb']:.0f} MiB (render workers {result['peak_rss_children_mb']:.0f} MiB)")
+    for stage, stats in result['stages'].items():
+        print(f"  {stage:10} n={stats['count']:<5} p50 {stats['p50_ms']:8.1f} ms  "
+              f"p90 {stats['p90_ms']:8.1f} ms  p99 {stats['p99_ms']:8.1f} ms")
+    for failure in result['failures']:
+        print(f"  FAILED {failure}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark jackbot end to end against local stub services')
+    parser.add_argument('-g', '--game', dest='games', action='append',
+                        help='Game to include. Default: every game that can be replayed')
+    parser.add_argument('-n', '--repeat', type=int, default=2, help='Copies of every game to process. Default 2')
+    parser.add_argument('-m', '--mode', choices=[*MODES, 'both'], default='both',
+                        help='Pipeline to run: serial, concurrent or both. Default both')
+    parser.add_argument('--latency', type=float, default=20, help='Milliseconds added to every stub response')
+    parser.add_argument('--bandwidth', type=float, default=0,
+                        help='Stub bandwidth per response in KiB/s. Default 0 (unlimited)')
+    parser.add_argument('--image-kb', type=int, default=64, help='Size of the images served by the stub')
+    parser.add_argument('--renderer', help='Render backend to use (cairo or svg)')
+    parser.add_argument('--render-workers', type=int,
+                        help='Render processes in concurrent mode. Default: number of CPUs')
+    parser.add_argument('--paced', action='store_true', help="Keep Slack's rate limits instead of lifting them")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='Directory of recorded artifacts')
+    parser.add_argument('-o', '--output', default='jackbot-bench-e2e.json',
+                        help='Result file. Default jackbot-bench-e2e.json')
+    parser.add_argument('--run-mode', help=argparse.SUPPRESS)
+    parser.add_argument('--urls', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        with open(args.urls, encoding='utf-8') as file:
+            run_mode(args.run_mode, json.loads(file.read()))
+        return
+
+    # pylint: disable=import-outside-toplevel
+    from jackbox.core import registry
+    from bin.stubs import StubServer
+
+    games = args.games or [name for name in dict.fromkeys(registry.CATEGORIES.values()) if name not in SKIPPED_GAMES]
+    urls, artifacts = build_workload(games, args.repeat, args.fixtures)
+    server = StubServer(artifacts, latency=args.latency / 1000, bandwidth=args.bandwidth * 1024 or None,
+                        image_bytes=args.image_kb * 1024).start()
+    modes = list(MODES) if args.mode == 'both' else [args.mode]
+    print(f"INFO: {len(urls)} games ({', '.join(games)}), stub latency {args.latency:g} ms, "
+          f"bandwidth {f'{args.bandwidth:g} KiB/s' if args.bandwidth else 'unlimited'}")
+
+    report = {'settings': {key: value for key, value in vars(args).items() if key not in ('run_mode', 'urls')},
+              'games': games, 'modes': {}}
+    try:
+        with tempfile.TemporaryDirectory(prefix='jackbot-bench-') as work_dir:
+            urls_file = os.path.join(work_dir, 'urls.json')
+            with open(urls_file, 'w', encoding='utf-8') as file:
+                file.write(json.dumps(urls))
+            for mode in modes:
+                server.requests.clear()
+                result = run_mode_process(mode, mode_config(server, mode, args, work_dir), urls_file, work_dir)
+                result['requests'] = dict(server.requests)
+                report['modes'][mode] = result
+                print_result(mode, result)
+    finally:
+        server.shutdown()
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        file.write(json.dumps(report, indent=2))
+    print(f"\nINFO: Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
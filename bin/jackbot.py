@@ -2,23 +2,172 @@
 
 import sys
 import argparse
-import os
+import signal
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from jackbox import Jackbox
+from jackbox.core import messages, metrics, registry, trace
+from jackbox.core.render import close_render_pools
 
-# import all modules in jackbox package
-PACKAGE = "jackbox"
-modules_names = []
-for module in os.listdir(f"{os.path.dirname(__file__)}/../{PACKAGE}/"):
-    if module == '__init__.py' or module == 'jackbox.py' or module[-3:] != '.py':
-        continue
-    modules_names.append(module[:-3])
-    __import__(f"{PACKAGE}.{module[:-3]}", locals(), globals())
-    del module
 
+def read_urls(args):
+    """Collect the game URLs of a batch from the command line and the --file argument ('-' is stdin)."""
+    urls = list(args.urls)
+    if args.url_file:
+        if args.url_file == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(args.url_file, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+        urls.extend(line.strip() for line in lines if line.strip() and not line.strip().startswith('#'))
+    return urls
 
-def main():
-    # Parse arguments
+
+def run_game(url, args):
+    """Process one game of a batch in its own work directory.
+
+    Returns:
+        (game instance or None, status, error message or None)
+    """
+    started = time.monotonic()
+    name, game, status, error = _run_game(url, args)
+    if game:
+        game.report_stats()
+    metrics.GAMES.inc(game=name, status=status)
+    metrics.GAME_SECONDS.observe(time.monotonic() - started, game=name)
+    return game, status, error
+
+
+def _run_game(url, args):
+    """Run one game. Returns (registry game name or 'unknown', game instance or None, status, error)."""
+    name = 'unknown'
+    game = None
+    try:
+        game_spec, game_id = registry.parse_url(url)
+        if game_spec is None:
+            return name, None, 'failed', f"Unsupported game URL {url}"
+        name = game_spec.name
+        game_class = registry.load(game_spec)
+        with tempfile.TemporaryDirectory(prefix='jackbot-') as work_dir:
+            game = game_class(
+                game_id=game_id,
+                api_account=args.api_account,
+                dry_run=args.dry_run,
+                offline=args.offline,
+                repost=args.repost,
+                work_dir=work_dir
+            )
+            with trace.span('game', url=url):
+                game.process_game()
+    except (Exception, SystemExit) as exc:  # pylint: disable=broad-except
+        return name, game, 'failed', str(exc)
+    if game.send_ok is None:
+        return name, game, 'failed', 'No results were posted'
+    if not game.send_ok:
+        return name, game, 'failed', 'Sending to Slack failed'
+    return name, game, 'ok', None
+
+
+def run_batch(urls, args):
+    """Process several games concurrently, sharing the Slack client, HTTP pool and caches."""
+    print(f"INFO: Processing {len(urls)} games with {args.jobs} workers")
+
+    def timed(url):
+        started = time.monotonic()
+        return (*run_game(url, args), time.monotonic() - started)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        results = list(executor.map(timed, urls))
+
+    print("\nSummary:")
+    for url, (game, status, error, seconds) in zip(urls, results):
+        sent = game.sent_messages if game else 0
+        print(f"  {status.upper():6} {seconds:7.1f}s  {sent:3} messages  {url}")
+        if error:
+            print(f"         {error}")
+    failed = sum(1 for _, status, _, _ in results if status != 'ok')
+    print(f"INFO: {len(urls) - failed}/{len(urls)} games processed successfully")
+    return failed == 0
+
+
+def run_watch(args):
+    """Process game URLs as they are submitted through a watched directory or the local endpoint.
+
+    Runs until interrupted. The Slack client, channel ID, HTTP pool, caches and render
+    workers stay warm between games.
+    """
+    # pylint: disable=import-outside-toplevel
+    from jackbox.core.watch import DirectoryWatcher, SubmissionQueue, SubmissionServer
+
+    submissions = SubmissionQueue()
+    stopping = threading.Event()
+    running = set()
+    recent = deque(maxlen=50)
+    lock = threading.Lock()
+
+    def status():
+        with lock:
+            return {'queued': len(submissions), 'running': sorted(running), 'recent': list(recent)}
+
+    def worker():
+        while not stopping.is_set():
+            url = submissions.get(timeout=1)
+            if url is None:
+                continue
+            with lock:
+                running.add(url)
+            started = time.monotonic()
+            try:
+                game, result, error = run_game(url, args)
+            finally:
+                submissions.done(url)
+            seconds = time.monotonic() - started
+            sent = game.sent_messages if game else 0
+            print(f"INFO: {result.upper()} {url} in {seconds:.1f}s, {sent} messages" + (f": {error}" if error else ""))
+            metrics.flush()
+            with lock:
+                running.discard(url)
+                recent.append({'url': url, 'status': result, 'error': error, 'seconds': round(seconds, 1),
+                               'messages': sent, 'finished': time.time()})
+
+    sources = []
+    if args.watch_dir:
+        sources.append(DirectoryWatcher(args.watch_dir, submissions.submit))
+    if args.listen_port is not None:
+        sources.append(SubmissionServer(args.listen_port, submissions.submit, status))
+    for source in sources:
+        source.start()
+    workers = [threading.Thread(target=worker, name=f'game-worker-{i}') for i in range(max(1, args.jobs))]
+    for thread in workers:
+        thread.start()
+
+    # Stop on SIGTERM too, so the service manager of a daemon can shut it down cleanly
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    print(f"INFO: Waiting for games with {len(workers)} workers, press Ctrl+C to stop")
+    try:
+        while not stopping.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("INFO: Stopping, waiting for the games in progress to finish")
+        stopping.set()
+        for source in sources:
+            if isinstance(source, SubmissionServer):
+                source.shutdown()
+            else:
+                source.stop()
+                source.join()
+        for thread in workers:
+            thread.join()
+        close_render_pools()
+
+
+def build_parser():
     parser = argparse.ArgumentParser(
         description='Pull results from Jackbox game',
     )
@@ -28,7 +177,7 @@ def main():
         dest="game_name",
         help=f'''
         Game for which to retrieve results
-        ex: {", ".join(modules_names)}
+        ex: {", ".join(registry.names())}
         '''
     )
 
@@ -52,6 +201,39 @@ def main():
             '''
     )
 
+    parser.add_argument(
+        "urls",
+        nargs="*",
+        help='Game URLs to process in one batch',
+    )
+
+    parser.add_argument(
+        "-f", "--file",
+        dest="url_file",
+        help='File with one game URL per line to process in one batch, or - to read them from stdin',
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        dest="jobs",
+        type=int,
+        default=3,
+        help='Number of games of a batch, or in watch mode, processed concurrently. Default 3',
+    )
+
+    parser.add_argument(
+        "-w", "--watch",
+        dest="watch_dir",
+        help='Keep running and process the game URLs of files dropped into this directory',
+    )
+
+    parser.add_argument(
+        "-l", "--listen",
+        dest="listen_port",
+        type=int,
+        help='Keep running and accept game URLs POSTed to http://127.0.0.1:PORT/',
+    )
+
     parser.add_argument(
         "-a", "--api_account",
         dest="api_account",
@@ -66,20 +248,109 @@ def main():
         help='Purge successfully converted source files',
     )
 
+    parser.add_argument(
+        '-o', '--offline',
+        action='store_true',
+        dest='offline',
+        help='Use only locally stored game artifacts and cached images, never contacting fishery or S3',
+    )
+
+    parser.add_argument(
+        '-r', '--repost',
+        action='store_true',
+        dest='repost',
+        help='Post the whole game again, ignoring messages already delivered by earlier runs',
+    )
+
     parser.add_argument(
         '-m', '--manage-messages',
         action='store_true',
         dest='manage_messages',
-        help='List and delete bot messages from the Slack channel',
+        help='List and delete bot messages from the Slack channel. With any of --older-than, --game, --has-files '
+             'or --max, delete the matching messages without prompting (only report them with -d)',
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        '--older-than',
+        dest='older_than',
+        type=float,
+        metavar='DAYS',
+        help='With -m, only delete messages older than this many days',
+    )
 
-    # Handle message management mode
-    if args.manage_messages:
+    parser.add_argument(
+        '--game',
+        dest='prune_game',
+        metavar='NAME',
+        help="With -m, only delete games of this game name, category or title, e.g. drawful or \"Champ'd UP\"",
+    )
+
+    parser.add_argument(
+        '--has-files',
+        action='store_true',
+        dest='has_files',
+        help='With -m, only delete messages whose thread has uploaded files',
+    )
+
+    parser.add_argument(
+        '--max',
+        dest='max_messages',
+        type=int,
+        metavar='N',
+        help='With -m, delete at most this many messages, newest first',
+    )
+
+    parser.add_argument(
+        '--trace',
+        dest='trace_file',
+        metavar='FILE',
+        help='Append timing spans (config, channel, artifact, images, renders, Slack sends) to FILE as JSON lines',
+    )
+
+    parser.add_argument(
+        '--chrome-trace',
+        dest='chrome_trace_file',
+        metavar='FILE',
+        help='Write the timing spans to FILE in Chrome trace format, for chrome://tracing or ui.perfetto.dev',
+    )
+
+    parser.add_argument(
+        '--metrics-file',
+        dest='metrics_file',
+        metavar='FILE',
+        help='Write Prometheus metrics to FILE (e.g. for the node_exporter textfile collector) at exit, '
+             'and after every game in watch mode',
+    )
+
+    parser.add_argument(
+        '--metrics-port',
+        dest='metrics_port',
+        type=int,
+        metavar='PORT',
+        help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running',
+    )
+    return parser
+
+
+def run_messages(args):
+    """List and delete bot messages interactively, or prune the ones matching the filters given with -m."""
+    if args.older_than is None and args.prune_game is None and not args.has_files and args.max_messages is None:
         Jackbox.manage_messages(api_account=args.api_account)
         return
+    _, failed = messages.prune_messages(
+        Jackbox.message_manager(args.api_account),
+        older_than=args.older_than,
+        game=args.prune_game,
+        has_files=args.has_files,
+        limit=args.max_messages,
+        dry_run=args.dry_run,
+    )
+    if failed:
+        sys.exit(1)
+
 
+def run_single(args):
+    """Process the one game given by -g and -i, or -u, asking for the game and ID if neither is given."""
     if args.game_url is None:
         if args.game_name is None:
             args.game_name = input("Enter game: ")
@@ -91,23 +362,54 @@ def main():
 
     print(args)
 
-    module_name = f"{PACKAGE}.{args.game_name.lower()}"
-    if module_name in sys.modules:
+    game_spec = registry.find(args.game_name)
+    if game_spec is not None:
         method = "process_game"
-        _module = getattr(sys.modules[module_name], args.game_name.title())(
+        _module = registry.load(game_spec)(
             game_id=args.game_id,
             api_account=args.api_account,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            offline=args.offline,
+            repost=args.repost
         )
         if hasattr(_module, method):
+            started = time.monotonic()
+            status = 'failed'
             try:
-                getattr(_module, method)()
+                with trace.span('game', url=args.game_url or f"{args.game_name}/{args.game_id}"):
+                    getattr(_module, method)()
+                status = 'ok' if _module.send_ok else 'failed'
             except Exception as exc:  # pylint: disable=broad-except
                 raise exc
+            finally:
+                metrics.GAMES.inc(game=game_spec.name, status=status)
+                metrics.GAME_SECONDS.observe(time.monotonic() - started, game=game_spec.name)
+                _module.report_stats()
         else:
-            sys.exit(f"ERROR: Module '{module_name}' does not have method '{method}'")
+            sys.exit(f"ERROR: Module '{game_spec.module}' does not have method '{method}'")
+    else:
+        sys.exit(f"ERROR: Unsupported game '{args.game_name}', expected one of {', '.join(registry.names())}")
+
+
+def main():
+    args = build_parser().parse_args()
+    trace.configure(args.trace_file, args.chrome_trace_file)
+    metrics.configure(args.metrics_file, args.metrics_port)
+
+    if args.manage_messages:
+        run_messages(args)
+    elif args.watch_dir or args.listen_port is not None:
+        run_watch(args)
+    elif args.urls or args.url_file:
+        urls = read_urls(args)
+        if args.game_url:
+            urls.insert(0, args.game_url)
+        if not urls:
+            sys.exit("ERROR: No game URLs given")
+        if not run_batch(urls, args):
+            sys.exit(1)
     else:
-        sys.exit(f"ERROR: Module '{module_name}' is missing")
+        run_single(args)
 
 
 if __name__ == '__main__':
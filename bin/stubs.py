@@ -0,0 +1,142 @@
+"""Local stand-ins for fishery, S3 and the Slack Web API, used by the benchmarks."""
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+CHANNEL_NAME = 'bench'
+CHANNEL_ID = 'CBENCH00001'
+BOT_USER_ID = 'UBENCH00001'
+
+# Fixed answers of the Slack methods whose response does not depend on the request
+SLACK_RESPONSES = {
+    'auth.test': {'ok': True, 'user_id': BOT_USER_ID},
+    'conversations.list': {'ok': True, 'channels': [{'name': CHANNEL_NAME, 'id': CHANNEL_ID}],
+                           'response_metadata': {'next_cursor': ''}},
+    'conversations.history': {'ok': True, 'messages': [], 'response_metadata': {'next_cursor': ''}},
+    'conversations.replies': {'ok': True, 'messages': [], 'response_metadata': {'next_cursor': ''}},
+    'files.completeUploadExternal': {'ok': True, 'files': []},
+}
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP server answering the requests jackbot makes to fishery, S3 and Slack.
+
+    Routes:
+        GET  /fishery/artifact/{category}/{game_id}              artifact JSON
+        GET  /fishery/artifact/{ext}/{category}/{game_id}/{idx}  image generation
+        GET  /s3/{category}/{game_id}/{name}                     image bytes
+        POST /slack/api/{method}                                 Slack Web API
+        POST /upload/{file_id}                                   file upload URL
+
+    Args:
+        artifacts: {(category, game_id): artifact bytes}; unknown artifacts are answered with ``{}``
+        latency: Seconds added before every response
+        bandwidth: Bytes per second responses are sent at; None sends them at full speed
+        image_bytes: Size of the images served from S3
+    """
+    daemon_threads = True
+
+    def __init__(self, artifacts: dict = None, latency: float = 0.0, bandwidth: float = None,
+                 image_bytes: int = 64 * 1024):
+        self.artifacts = artifacts or {}
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.image = b'\x89PNG\r\n\x1a\n' + bytes(max(0, image_bytes - 8))
+        self.requests = Counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), _StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def config(self, **overrides) -> dict:
+        """Return account config pointing jackbot at this server."""
+        return {
+            'slack_token': 'xoxb-bench',
+            'slack_channel': CHANNEL_NAME,
+            'slack_base_url': f"{self.url}/slack/api/",
+            'fishery_url': f"{self.url}/fishery/artifact",
+            's3_url': f"{self.url}/s3",
+            **overrides,
+        }
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def count(self, route: str):
+        with self._lock:
+            self.requests[route] += 1
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name='stub-server', daemon=True).start()
+        return self
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, code: int, body: bytes, content_type: str = 'application/json'):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        bandwidth = self.server.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        chunk_size = 16 * 1024
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start:start + chunk_size]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / bandwidth)
+
+    def _json(self, payload: dict, code: int = 200):
+        self._send(code, json.dumps(payload).encode())
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        parts = urlparse(self.path).path.strip('/').split('/')
+        if parts[:2] == ['fishery', 'artifact'] and len(parts) == 4:
+            self.server.count('fishery.artifact')
+            self._send(200, self.server.artifacts.get((parts[2], parts[3]), b'{}'))
+        elif parts[:2] == ['fishery', 'artifact'] and len(parts) == 6:
+            self.server.count('fishery.generate')
+            self._send(200, b'OK', 'text/plain')
+        elif parts[0] == 's3':
+            self.server.count('s3.image')
+            self._send(200, self.server.image, 'image/png')
+        else:
+            self._json({'error': 'not found'}, 404)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        parts = urlparse(self.path).path.strip('/').split('/')
+        if parts[0] == 'upload':
+            self.server.count('slack.upload')
+            self._send(200, b'OK', 'text/plain')
+        elif parts[:2] == ['slack', 'api'] and len(parts) == 3:
+            self.server.count(f"slack.{parts[2]}")
+            self._json(self._slack(parts[2]))
+        else:
+            self._json({'error': 'not found'}, 404)
+
+    def _slack(self, method: str) -> dict:
+        if method == 'chat.postMessage':
+            return {'ok': True, 'channel': CHANNEL_ID, 'ts': f"1700000000.{self.server.next_id():06d}"}
+        if method == 'files.getUploadURLExternal':
+            file_id = f"FBENCH{self.server.next_id():06d}"
+            return {'ok': True, 'upload_url': f"{self.server.url}/upload/{file_id}", 'file_id': file_id}
+        return SLACK_RESPONSES.get(method, {'ok': True})
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
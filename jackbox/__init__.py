@@ -1,40 +1,70 @@
 import json
+import os
 import re
 import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from slack_sdk import WebClient
-import requests
-
-
-class Jackbox:  # pylint: disable=too-many-instance-attributes
-
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
+from slack_sdk.errors import SlackApiError
+from jackbox.core import messages as bot_messages
+from jackbox.core import metrics, registry, trace
+from jackbox.core.cache import ArtifactStore, ChannelIndex, FileCache, cache_dir, digest
+from jackbox.core.cleanup import BulkDeleter
+from jackbox.core.http import DownloadTooLarge, get_client, stream_to_file
+from jackbox.core.history import HistoryScanner
+from jackbox.core.journal import DeliveryJournal
+from jackbox.core.render import DEFAULT_RENDERER, default_workers, get_render_pool, timed_render
+from jackbox.core.retry import RetryPolicy
+from jackbox.core.slack import MAX_FILES_PER_MESSAGE, FileUploader, SlackDispatcher, concurrency_for
+
+
+class Jackbox:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    # Attributes set up once per account and shared by every game instance in this process
+    _SHARED_ATTRIBUTES = (
+        'config', 'slack_client', 'slack_channel', '_slack_workspace', '_slack_channel_name', 'channel_index',
+        '_cache_dir', 'render_cache', 'blob_cache', 'artifact_store', 'journal',
+    )
+    _shared = {}
+    _shared_lock = threading.Lock()
+    # Bot user ID per Slack workspace, so auth.test is called once per process
+    _bot_user_ids = {}
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, offline: bool = False,
+            repost: bool = False, work_dir: str = None):
         self.dry_run = dry_run
+        self.offline = offline
+        self.repost = repost
         self.api_account = api_account
+        # Directory the game's images are written to; None writes them to the current directory
+        self.work_dir = os.path.abspath(work_dir) if work_dir else None
         self.ext = 'gif'
-        config_file = f'{str(Path.home())}/.config/jackbot/config.json'
-        try:
-            with open(config_file) as file:
-                config_json = json.loads(file.read())
-        except FileNotFoundError as _fe:
-            sys.exit(f"ERROR: config file not found {config_file}:\n\t{_fe}")
-        except json.decoder.JSONDecodeError as _je:
-            sys.exit(f"ERROR: invalid config file format {config_file}:\n\t{_je}")
-
-        if self.api_account in config_json:
-            config = config_json[self.api_account]
-        else:
-            sys.exit(f"API account not defined: {self.api_account}")
-
-        self.slack_client = None if self.dry_run else WebClient(token=config['slack_token'])
-        # Use slack_channel_id if set, otherwise resolve slack_channel name to ID
-        if config.get('slack_channel_id'):
-            self.slack_channel = config['slack_channel_id']
-            print(f"Using configured channel ID: {self.slack_channel}")
-        else:
-            self.slack_channel = self._resolve_channel_id(config['slack_channel'])
-
-        self._fishery_url = "https://fishery.jackboxgames.com/artifact"
+        # Set by _setup_account, or copied from the instance that set up this account
+        self.slack_client = None
+        self.slack_channel = None
+        self.channel_index = None
+        self._slack_workspace = None
+        self._slack_channel_name = None
+        with Jackbox._shared_lock:
+            shared = Jackbox._shared.get((api_account, dry_run))
+            if shared is None:
+                self._setup_account(self.load_config(self.api_account))
+                shared = {name: getattr(self, name) for name in self._SHARED_ATTRIBUTES}
+                Jackbox._shared[(api_account, dry_run)] = shared
+            else:
+                self.__dict__.update(shared)
+        config = self.config
+        # Keep-alive connection pool shared by every game instance in this process
+        self.http = get_client(config)
+
+        self._fishery_url = config.get('fishery_url', "https://fishery.jackboxgames.com/artifact").rstrip('/')
+        self._s3_url = config.get('s3_url', "https://s3.amazonaws.com/jbg-blobcast-artifacts").rstrip('/')
+        self._data_category = None
         self._data_url = None
         self._gallery_url = None
         self._base_image_url = None
@@ -43,7 +73,24 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
         self._game_id = None
         self.game_id = game_id
         self._game_name = None
-        self._max_attempts = 5
+        self.retry_policy = RetryPolicy.from_config(config)
+        self._fetch_workers = int(config.get('fetch_workers', 8))
+        self._upload_concurrency = concurrency_for(config, 'files.getUploadURLExternal')
+        self._upload_batch_size = max(1, min(int(config.get('slack_upload_batch_size', MAX_FILES_PER_MESSAGE)),
+                                             MAX_FILES_PER_MESSAGE))
+        self._download_chunk_size = int(config.get('download_chunk_kb', 64)) * 1024
+        self._download_max_bytes = int(float(config.get('download_max_mb', 100)) * 1024 * 1024)
+        self._render_workers = int(config.get('render_workers', default_workers()))
+        self.renderer = config.get('renderer', DEFAULT_RENDERER)
+        # Artifacts of finished games never change, so by default a stored copy is used without asking fishery
+        self._revalidate_artifacts = bool(config.get('artifact_revalidate', False))
+        self._deliveries = None
+        # Outcome of send_queued_messages: None until it runs, then whether every message was delivered
+        self.send_ok = None
+        self.sent_messages = 0
+        # Cache hits and misses of this game, keyed by (cache, 'hits' or 'misses')
+        self._cache_counts = Counter()
+        self._cache_counts_lock = threading.Lock()
 
         # Message queue for batching Slack messages
         self._pending_messages = []
@@ -65,6 +112,7 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
 
     @data_url.setter
     def data_url(self, value):
+        self._data_category = value
         self._data_url = f"{self._fishery_url}/{value}/{self.game_id}"
 
     @property
@@ -82,7 +130,7 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
 
     @base_image_url.setter
     def base_image_url(self, value):
-        self._base_image_url = f"https://s3.amazonaws.com/jbg-blobcast-artifacts/{value}/{self.game_id}"
+        self._base_image_url = f"{self._s3_url}/{value}/{self.game_id}"
 
     @property
     def base_gen_image_url(self):
@@ -100,6 +148,10 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
     def game_name(self, value):
         self._game_name = re.sub(r"([A-Z,0-9])", r" \1", value).strip()
 
+    @property
+    def _game_key(self):
+        return f"{self._data_category}/{self.game_id}"
+
     @staticmethod
     def parse_game_url(url):
         url_parts = url.strip("/").split("/")
@@ -119,16 +171,77 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
             _string = _string.replace(' ', '_')
         return _string
 
+    @staticmethod
+    def load_config(api_account: str) -> dict:
+        """Load the config of an API account, exiting if it is missing.
+
+        The config is read from ~/.config/jackbot/config.json, or from the file named by the
+        JACKBOT_CONFIG environment variable.
+        """
+        config_file = os.environ.get('JACKBOT_CONFIG', f'{str(Path.home())}/.config/jackbot/config.json')
+        with trace.span('config', account=api_account):
+            try:
+                with open(config_file) as file:
+                    config_json = json.loads(file.read())
+            except FileNotFoundError as _fe:
+                sys.exit(f"ERROR: config file not found {config_file}:\n\t{_fe}")
+            except json.decoder.JSONDecodeError as _je:
+                sys.exit(f"ERROR: invalid config file format {config_file}:\n\t{_je}")
+
+            if api_account in config_json:
+                return config_json[api_account]
+            sys.exit(f"API account not defined: {api_account}")
+
+    def _setup_account(self, config: dict):
+        """Connect to Slack and open the persistent caches of an account."""
+        self.config = config
+        self._connect_slack(config)
+        self._cache_dir = cache_dir(config)
+        render_cache_bytes = int(float(config.get('render_cache_max_mb', 256)) * 1024 * 1024)
+        self.render_cache = FileCache(f"{self._cache_dir}/renders", render_cache_bytes) if render_cache_bytes else None
+        blob_cache_bytes = int(float(config.get('blob_cache_max_mb', 1024)) * 1024 * 1024)
+        self.blob_cache = FileCache(f"{self._cache_dir}/blobs", blob_cache_bytes) if blob_cache_bytes else None
+        self.artifact_store = None
+        if config.get('artifact_cache', True):
+            self.artifact_store = ArtifactStore(f"{self._cache_dir}/artifacts")
+        # Messages already posted for each game, so a failed run can be resumed instead of repeated
+        self.journal = None
+        if config.get('delivery_journal', True) and not self.dry_run:
+            self.journal = DeliveryJournal(f"{self._cache_dir}/journal.sqlite")
+
+    def _path(self, filename: str) -> str:
+        """Return where a game file is written, inside work_dir if one is set."""
+        return os.path.join(self.work_dir, filename) if self.work_dir else filename
+
+    def _connect_slack(self, config: dict):
+        """Create the Slack client and resolve the channel to post to."""
+        self.slack_client = None
+        if not self.dry_run:
+            client = WebClient(token=config['slack_token'], base_url=config.get('slack_base_url', WebClient.BASE_URL))
+            self.slack_client = SlackDispatcher(client, config)
+        self._slack_workspace = digest(config['slack_token'])
+        self._slack_channel_name = None
+        ttl_hours = float(config.get('channel_cache_ttl_hours', 24))
+        self.channel_index = None
+        if ttl_hours > 0:
+            self.channel_index = ChannelIndex(f"{cache_dir(config)}/channels.json", ttl_hours * 3600)
+
+        # Use slack_channel_id if set, otherwise resolve slack_channel name to ID
+        if config.get('slack_channel_id'):
+            self.slack_channel = config['slack_channel_id']
+            print(f"Using configured channel ID: {self.slack_channel}")
+        else:
+            with trace.span('channel', channel=config['slack_channel']):
+                self.slack_channel = self._resolve_channel_id(config['slack_channel'])
+
     def _resolve_channel_id(self, channel):
         """Resolve a channel name to a channel ID.
 
         If the channel is already an ID (starts with C, G, D, or Z followed by alphanumeric),
-        return it as-is. Otherwise, look up the channel ID from the Slack API.
+        return it as-is. Otherwise, look it up in the persistent channel index, which is built
+        from one paged pass over conversations.list. A stale index entry is used right away
+        and the index is refreshed in the background.
         """
-        import builtins
-        import time
-        from slack_sdk.errors import SlackApiError
-
         print(f"DEBUG: _resolve_channel_id called with channel='{channel}'")
         if self.dry_run or not channel:
             return channel
@@ -141,91 +254,308 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
 
         # Strip # prefix if present
         channel_name = channel.lstrip('#')
-        print(f"Looking up channel ID for '{channel_name}'...")
+        self._slack_channel_name = channel_name
 
-        # Look up channel ID from Slack API with retry logic for rate limiting
-        max_retries = 5
-        retry_delay = 1  # Start with 1 second
-
-        for attempt in builtins.range(max_retries):
-            try:
-                cursor = None
-                while True:
-                    response = self.slack_client.conversations_list(
-                        types="public_channel,private_channel",
-                        limit=200,
-                        cursor=cursor
-                    )
-                    if response['ok']:
-                        for ch in response['channels']:
-                            if ch['name'] == channel_name:
-                                print(f"Found channel ID: {ch['id']} for '{channel_name}'")
-                                return ch['id']
-                        # Check for pagination
-                        cursor = response.get('response_metadata', {}).get('next_cursor')
-                        if not cursor:
-                            break
-                    else:
-                        print(f"WARNING: Failed to list channels: {response.get('error')}")
-                        break
-                # If we get here without finding the channel, break out of retry loop
-                break
-            except SlackApiError as ex:
-                if ex.response.get('error') == 'ratelimited':
-                    # Get retry-after header if available, otherwise use exponential backoff
-                    retry_after = int(ex.response.headers.get('Retry-After', retry_delay))
-                    print(f"Rate limited. Waiting {retry_after} seconds before retry ({attempt + 1}/{max_retries})...")
-                    time.sleep(retry_after)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    print(f"WARNING: Failed to resolve channel ID for '{channel}': {ex}")
-                    break
-            except Exception as ex:
-                print(f"WARNING: Failed to resolve channel ID for '{channel}': {ex}")
-                break
+        try:
+            if self.channel_index:
+                channel_id, stale = self.channel_index.lookup(self._slack_workspace, channel_name)
+                if channel_id:
+                    print(f"Found cached channel ID: {channel_id} for '{channel_name}'")
+                    if stale:
+                        print("INFO: Channel index is stale, refreshing it in the background")
+                        self.channel_index.refresh(self._slack_workspace, self._list_channels, background=True)
+                    return channel_id
+
+                print(f"Looking up channel ID for '{channel_name}'...")
+                channel_id = self.channel_index.refresh(self._slack_workspace, self._list_channels).get(channel_name)
+            else:
+                print(f"Looking up channel ID for '{channel_name}'...")
+                channel_id = self._list_channels(stop_at=channel_name).get(channel_name)
+            if channel_id:
+                print(f"Found channel ID: {channel_id} for '{channel_name}'")
+                return channel_id
+        except Exception as ex:  # pylint: disable=broad-except
+            print(f"WARNING: Failed to resolve channel ID for '{channel}': {ex}")
 
         # Return original value if lookup fails
         print(f"WARNING: Could not find channel ID for '{channel}', using as-is")
         return channel
 
+    def _list_channels(self, stop_at: str = None) -> dict:
+        """Return {name: id} for every channel visible to the bot, paging through conversations.list.
+
+        Args:
+            stop_at: Stop paging as soon as a channel with this name has been listed
+        """
+        channels = {}
+        cursor = None
+        while True:
+            response = self.slack_client.conversations_list(
+                types="public_channel,private_channel",
+                limit=200,
+                cursor=cursor
+            )
+            if not response['ok']:
+                raise RuntimeError(f"Failed to list channels: {response.get('error')}")
+            channels.update((ch['name'], ch['id']) for ch in response['channels'])
+            if stop_at in channels:
+                break
+            # Check for pagination
+            cursor = response.get('response_metadata', {}).get('next_cursor')
+            if not cursor:
+                break
+        return channels
+
+    def _check_channel_error(self, ex: Exception):
+        """Drop the cached ID of the configured channel if Slack no longer knows it."""
+        if not isinstance(ex, SlackApiError) or ex.response.get('error') != 'channel_not_found':
+            return
+        if self.channel_index and self._slack_channel_name:
+            print(f"WARNING: Channel '{self._slack_channel_name}' not found, removing it from the channel index")
+            self.channel_index.invalidate(self._slack_workspace, self._slack_channel_name)
+
     def process_game(self):
-        response = requests.get(self.data_url)
+        """Load the game's artifact. Subclasses call this first, then post the results."""
+        with trace.span('artifact', game=self._game_key) as span:
+            data = False
+            try:
+                data = self._load_artifact(span)
+            finally:
+                span['ok'] = data is not False
+                metrics.ARTIFACTS.inc(source=span['source'] if span['ok'] else 'failed')
+            return data
+
+    def _load_artifact(self, span: dict):
+        """Return the parsed artifact, from the artifact store or fishery, or False if it is unavailable."""
+        body, metadata = (None, None)
+        if self.artifact_store:
+            body, metadata = self.artifact_store.load(self._data_category, self.game_id)
+        if body is not None and (self.offline or not self._revalidate_artifacts):
+            print(f"INFO: Using stored artifact for {self._game_key}")
+            span['source'] = 'store'
+            return json.loads(body)
+        if self.offline:
+            print(f"ERROR: No stored artifact for {self._game_key} and running offline")
+            return False
+
+        headers = {}
+        if body is not None:
+            if metadata.get('etag'):
+                headers['If-None-Match'] = metadata['etag']
+            if metadata.get('last_modified'):
+                headers['If-Modified-Since'] = metadata['last_modified']
+        response = self.retry_policy.run(
+            lambda: self.http.get(self.data_url, headers=headers), f"Fetching artifact {self.data_url}"
+        )
+        span['status'] = response.status_code
+        if response.status_code == 304 and body is not None:
+            print(f"INFO: Stored artifact for {self._game_key} is still current")
+            span['source'] = 'store'
+            return json.loads(body)
         if response.status_code == 200:
-            return response.json()
+            span['source'] = 'fishery'
+            data = response.json()
+            if self.artifact_store:
+                self.artifact_store.save(self._data_category, self.game_id, response.content, response.headers)
+            return data
         print(
             f"ERROR: Invalid response from server for url {self.data_url}: ({response.status_code}) {response.text}"
         )
         return False
 
-    def generate_images(self, index: str, filename: str, attempt: int = 0, image_urls: dict | None = None):
+    def generate_images(self, index: str, filename: str, image_urls: dict | None = None):
+        source = None
+        try:
+            source = self._retrieve_image(index, filename, image_urls)
+            return source is not None
+        finally:
+            metrics.IMAGES.inc(source=source or 'failed')
+
+    def _retrieve_image(self, index: str, filename: str, image_urls: dict | None):
+        """Write an image to filename. Returns where it came from ('cache' or 'download'), or None on failure."""
         if image_urls is None:
             image_urls = {
                 "gif": f"{self.base_image_url}/anim_{index}.gif",
                 "png": f"{self.base_image_url}/image_{index}.png"
             }
+        image_url = image_urls[self.ext]
+        filename = self._path(filename)
+
+        # A cached copy makes both the render request and the download unnecessary
+        cache_key = digest(image_url)
+        if self.blob_cache:
+            hit = self.blob_cache.get(cache_key, filename)
+            self._count_cache('image', hit)
+            if hit:
+                print(f"INFO: Using cached image {image_url}")
+                return 'cache'
+        if self.offline:
+            print(f"ERROR: No cached copy of image {image_url} and running offline")
+            return None
 
         if self.ext == 'gif':
             url = f"{self.base_gen_image_url}/{index}"
-            response = requests.get(url)
-
             print(f"INFO: Generating image {url}")
+            with trace.span('image.generate', game=self._game_key, index=index) as span:
+                # The renderer answers non-200 until the animation is ready, so every failure is retried
+                response = self.retry_policy.run(
+                    lambda: self.http.get(url), f"Generating image {url}", retry_statuses=None
+                )
+                span['status'] = response.status_code
             if response.status_code != 200:
-                attempt += 1
-                print(f"ERROR: There was a problem generating image:\n{response.status_code}\t{response.text}\n"
-                      f"Attempt: {attempt} / {self._max_attempts}")
-                if attempt < self._max_attempts:
-                    return self.generate_images(index=index, filename=filename, attempt=attempt, image_urls=image_urls)
-                return False
-
-        print(f"INFO: Getting image {image_urls[self.ext]}")
-        response = requests.get(image_urls[self.ext])
-        if response.status_code != 200:
-            print(f"ERROR: There was a problem getting image:\n{response.status_code}\t{response.text}")
-            return False
-        with open(filename, 'wb') as file_handle:
-            file_handle.write(response.content)
+                print(f"ERROR: There was a problem generating image:\n{response.status_code}\t{response.text}")
+                return None
+
+        print(f"INFO: Getting image {image_url}")
+        with trace.span('image.download', game=self._game_key, index=index) as span:
+            response = self.retry_policy.run(
+                lambda: self.http.get(image_url, stream=True), f"Getting image {image_url}"
+            )
+            span['status'] = response.status_code
+            with response:
+                if response.status_code != 200:
+                    print(f"ERROR: There was a problem getting image:\n{response.status_code}\t{response.text}")
+                    return None
+                try:
+                    size, seconds = stream_to_file(
+                        response, filename, chunk_size=self._download_chunk_size, max_bytes=self._download_max_bytes
+                    )
+                except DownloadTooLarge as ex:
+                    print(f"ERROR: There was a problem getting image: {ex}")
+                    return None
+            span['bytes'] = size
+        print(f"INFO: Downloaded {filename}: {size / 1024:.1f} KiB in {seconds:.2f}s "
+              f"({size / 1024 / max(seconds, 1e-6):.1f} KiB/s)")
+
+        metrics.DOWNLOAD_BYTES.inc(size)
+        metrics.DOWNLOAD_SECONDS.observe(seconds)
+
+        if self.blob_cache:
+            self.blob_cache.put(cache_key, filename)
+        return 'download'
+
+    def generate_images_concurrently(self, jobs: list):
+        """Generate and download the images for several indices at once.
+
+        Args:
+            jobs: List of generate_images() keyword arguments (index, filename and optionally image_urls)
+
+        Returns:
+            List of booleans in the same order as jobs. If any job fails, every file retrieved by
+            the others is removed so the game fails as a whole.
+        """
+        if not jobs:
+            return []
+
+        delivered = self._delivered_files()
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, min(self._fetch_workers, len(jobs)))) as executor:
+            futures = [
+                None if os.path.basename(job['filename']) in delivered else executor.submit(self.generate_images, **job)
+                for job in jobs
+            ]
+            for job, future in zip(jobs, futures):
+                if future is None:
+                    print(f"INFO: Skipping {job['filename']}, already delivered")
+                    results.append(True)
+                    continue
+                try:
+                    results.append(future.result())
+                except Exception as ex:  # pylint: disable=broad-except
+                    print(f"ERROR: Failed to retrieve image {job['filename']}: {ex}")
+                    results.append(False)
+
+        if not all(results):
+            for job, result in zip(jobs, results):
+                if result and os.path.exists(self._path(job['filename'])):
+                    os.remove(self._path(job['filename']))
+        return results
+
+    def render_drawings(self, drawings: list):
+        """Rasterize normalized drawings on the shared render pool.
+
+        Drawings already in the render cache are copied from it instead of being rendered again, and
+        drawings already delivered by an earlier run of the game are skipped.
+
+        Args:
+            drawings: List of (Drawing, filename) tuples
+
+        Returns:
+            List of filenames in the same order as drawings
+        """
+        delivered = self._delivered_files()
+        jobs = []
+        keys = []
+        for drawing, filename in drawings:
+            if os.path.basename(filename) in delivered:
+                print(f"INFO: Skipping {filename}, already delivered")
+                continue
+            key = drawing.cache_key(self.renderer)
+            filename = self._path(filename)
+            if self.render_cache:
+                hit = self.render_cache.get(key, filename)
+                self._count_cache('render', hit)
+                if hit:
+                    print(f"INFO: Using cached render for {filename}")
+                    metrics.RENDERS.inc(source='cache')
+                    continue
+            jobs.append((drawing, filename, self.renderer))
+            keys.append(key)
+
+        results = get_render_pool(self._render_workers).map(timed_render, jobs)
+        for key, (filename, start, seconds, pid) in zip(keys, results):
+            # Timed in the worker, so the span shows the render itself rather than the time spent queued
+            trace.record('render', start, seconds, pid=pid, thread='render', game=self._game_key,
+                         file=os.path.basename(filename), renderer=self.renderer)
+            metrics.RENDERS.inc(source='render')
+            metrics.RENDER_SECONDS.observe(seconds, renderer=self.renderer)
+            if self.render_cache:
+                self.render_cache.put(key, filename)
+        return [self._path(filename) for _, filename in drawings]
+
+    def _delivered_messages(self) -> dict:
+        """Return {message_key: (type, file, ts)} for the messages of this game posted by earlier runs."""
+        if self.journal is None:
+            return {}
+        if self._deliveries is None:
+            if self.repost:
+                self.journal.forget(self._game_key, self.slack_channel)
+            self._deliveries = self.journal.delivered(self._game_key, self.slack_channel)
+        return self._deliveries
+
+    def _delivered_files(self) -> set:
+        """Return the names of the files of this game posted by earlier runs."""
+        return {file for _, file, _ in self._delivered_messages().values() if file}
+
+    @staticmethod
+    def _message_key(position: int, message: dict) -> str:
+        """Identify a queued message by its queue position, type and content."""
+        content = digest(
+            message.get('text'),
+            message.get('title'),
+            os.path.basename(message['file']) if message.get('file') else None,
+            message.get('initial_comment'),
+        )
+        return f"{position}:{message['type']}:{content[:16]}"
+
+    def _record_delivery(self, key: str, message: dict, ts: str = None):
+        self.sent_messages += 1
+        if self.journal is None:
+            return
+        file = os.path.basename(message['file']) if message.get('file') else None
+        self.journal.record(self._game_key, self.slack_channel, key, message['type'], file, ts)
+        self._deliveries[key] = (message['type'], file, ts)
+
+    def _count_cache(self, cache: str, hit: bool):
+        with self._cache_counts_lock:
+            self._cache_counts[cache, 'hits' if hit else 'misses'] += 1
 
-        return True
+    def report_stats(self):
+        """Print the cache hits and misses of this game. Called once process_game has finished."""
+        for cache, label in (('render', 'Render cache'), ('image', 'Image cache')):
+            hits, misses = self._cache_counts[cache, 'hits'], self._cache_counts[cache, 'misses']
+            if hits or misses:
+                print(f"INFO: {label} for {self._game_key}: {hits} hits, {misses} misses")
 
     def queue_intro_message(self):
         """Queue the intro message. Must be called before other messages.
@@ -295,6 +625,7 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
             thread_to_intro: If True, this message will be threaded to the intro message
             initial_comment: Initial comment for the file (optional)
         """
+        file = self._path(file)
         message = {
             'type': 'file_upload',
             'file': file,
@@ -328,61 +659,166 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
     def send_queued_messages(self):
         """Send all queued messages to Slack.
 
+        The intro message is posted before any file is uploaded, so nothing is left behind in
+        Slack if it fails. The files are then uploaded concurrently and shared into its thread
+        in queue order.
+
         Returns:
             True if all messages were sent successfully, False otherwise.
         """
         if not self.slack_client:
             print("INFO: No Slack client configured, skipping message send")
             self.clear_queue()
+            self.send_ok = True
             return True
 
-        print(f"INFO: Sending {len(self._pending_messages)} queued messages to Slack...")
-        intro_thread_ts = None
+        pending, intro_thread_ts = self._pending_deliveries()
+        print(f"INFO: Sending {len(pending)} queued messages to Slack...")
+        uploader = FileUploader(self.slack_client, self.http, self._upload_concurrency)
         try:
-            for message in self._pending_messages:
-                # Determine thread_ts for this message
-                thread_ts = None
-                if message.get('thread_to_intro') and intro_thread_ts:
-                    thread_ts = intro_thread_ts
-
+            for key, message in pending:
                 if message['type'] == 'intro_message':
-                    # Send intro message and capture its thread_ts
-                    response = self.slack_client.chat_postMessage(
-                        channel=message['channel'],
-                        text=message['text'],
-                        blocks=message['blocks']
-                    )
-                    intro_thread_ts = response['ts']
-                    print(f"INFO: Sent intro message, thread_ts={intro_thread_ts}")
-                elif message['type'] == 'file_upload':
-                    kwargs = {
-                        'file': message['file'],
-                        'title': message['title'],
-                        'channel': message['channel'],
-                    }
-                    if thread_ts:
-                        kwargs['thread_ts'] = thread_ts
-                    if 'initial_comment' in message:
-                        kwargs['initial_comment'] = message['initial_comment']
-                    self.slack_client.files_upload_v2(**kwargs)
-                elif message['type'] == 'chat_message':
-                    kwargs = {
-                        'channel': message['channel'],
-                        'text': message['text'],
-                    }
-                    if 'blocks' in message:
-                        kwargs['blocks'] = message['blocks']
-                    if thread_ts:
-                        kwargs['thread_ts'] = thread_ts
-                    self.slack_client.chat_postMessage(**kwargs)
+                    with self._sending(message['type']):
+                        intro_thread_ts = self._send_intro(key, message)
+            pending = [(key, message) for key, message in pending if message['type'] != 'intro_message']
+            uploads = self._start_uploads(uploader, pending)
+            for key, message in self._batch_file_uploads(pending):
+                thread_ts = intro_thread_ts if message.get('thread_to_intro') else None
+                with self._sending(message['type']):
+                    if message['type'] == 'chat_message':
+                        self._send_chat(key, message, thread_ts)
+                    else:
+                        self._complete_uploads(uploader, uploads, message, thread_ts)
             print("INFO: All messages sent successfully")
+            self.send_ok = True
             return True
         except Exception as ex:
             print(f"ERROR: Failed to send messages: {ex}")
+            self._check_channel_error(ex)
+            self.send_ok = False
             return False
         finally:
+            uploader.close()
             self.clear_queue()
 
+    def _pending_deliveries(self) -> tuple:
+        """Return the queued messages not delivered yet and the thread to resume.
+
+        Returns:
+            Tuple of ([(message_key, message), ...], thread_ts of the intro message if an earlier run posted it)
+        """
+        delivered = self._delivered_messages()
+        pending = []
+        intro_thread_ts = None
+        for position, message in enumerate(self._pending_messages):
+            key = self._message_key(position, message)
+            if key not in delivered:
+                pending.append((key, message))
+            elif message['type'] == 'intro_message':
+                # Resume into the thread of an intro message posted by an earlier run
+                intro_thread_ts = delivered[key][2]
+        if len(pending) < len(self._pending_messages):
+            print(f"INFO: Resuming, {len(self._pending_messages) - len(pending)} messages were already delivered")
+        return pending, intro_thread_ts
+
+    @contextmanager
+    def _sending(self, message_type: str):
+        """Trace the delivery of one queued message and count whether it succeeded."""
+        with trace.span('slack.send', game=self._game_key, type=message_type):
+            try:
+                yield
+            except Exception:
+                metrics.SLACK_MESSAGES.inc(type=message_type, status='failed')
+                raise
+        metrics.SLACK_MESSAGES.inc(type=message_type, status='ok')
+
+    def _send_intro(self, key: str, message: dict) -> str:
+        """Post the intro message. Returns its ts, which the rest of the game is threaded to."""
+        response = self.slack_client.chat_postMessage(
+            channel=message['channel'],
+            text=message['text'],
+            blocks=message['blocks']
+        )
+        intro_thread_ts = response['ts']
+        print(f"INFO: Sent intro message, thread_ts={intro_thread_ts}")
+        self._record_delivery(key, message, intro_thread_ts)
+        return intro_thread_ts
+
+    def _send_chat(self, key: str, message: dict, thread_ts: str = None):
+        kwargs = {
+            'channel': message['channel'],
+            'text': message['text'],
+        }
+        if 'blocks' in message:
+            kwargs['blocks'] = message['blocks']
+        if thread_ts:
+            kwargs['thread_ts'] = thread_ts
+        response = self.slack_client.chat_postMessage(**kwargs)
+        self._record_delivery(key, message, response['ts'])
+
+    @staticmethod
+    def _start_uploads(uploader: FileUploader, messages: list) -> dict:
+        """Begin uploading every queued file. Returns {message_key: Future of the Slack file id}."""
+        return {key: uploader.start(message['file']) for key, message in messages if message['type'] == 'file_upload'}
+
+    def _complete_uploads(self, uploader: FileUploader, uploads: dict, message: dict, thread_ts: str = None):
+        """Share the files of a 'file_upload' or 'file_batch' message, from _batch_file_uploads, in one message.
+
+        The initial comments of the files are joined, in file order, into the comment of that message.
+        """
+        files = message['files']
+        comments = [file_message['initial_comment'] for _, file_message in files if file_message.get('initial_comment')]
+        uploader.complete(
+            files=[{'id': uploads[key].result(), 'title': file_message['title']} for key, file_message in files],
+            channel=message['channel'],
+            thread_ts=thread_ts,
+            initial_comment='\n\n'.join(comments) or None,
+        )
+        if len(files) > 1:
+            print(f"INFO: Shared {len(files)} files in one message")
+        for key, file_message in files:
+            self._record_delivery(key, file_message)
+
+    def _batch_file_uploads(self, messages: list):
+        """Yield (message_key, message) pairs for the queue, coalescing runs of file uploads.
+
+        Consecutive file uploads for the same channel and thread are merged into 'file_batch'
+        messages of up to _upload_batch_size files, shared with a single API call; a file that
+        is not batched becomes a 'file_upload' message of one file. Either lists its queued
+        messages as (message_key, message) pairs under 'files'. Titles stay per file; initial
+        comments are shared together as the comment of the message.
+
+        Args:
+            messages: List of (message_key, message) pairs from the queue, in order
+        """
+        batch = []
+
+        def batched():
+            return batch[0][0], {
+                'type': 'file_batch' if len(batch) > 1 else 'file_upload',
+                'files': list(batch),
+                'channel': batch[0][1]['channel'],
+                'thread_to_intro': batch[0][1]['thread_to_intro'],
+            }
+
+        def joins(message):
+            first = batch[0][1]
+            return (message['type'] == 'file_upload'
+                    and len(batch) < self._upload_batch_size
+                    and message['channel'] == first['channel']
+                    and message['thread_to_intro'] == first['thread_to_intro'])
+
+        for key, message in messages:
+            if batch and not joins(message):
+                yield batched()
+                batch = []
+            if message['type'] == 'file_upload':
+                batch.append((key, message))
+            else:
+                yield key, message
+        if batch:
+            yield batched()
+
     def clear_queue(self, cleanup_files: bool = True):
         """Clear the message queue and optionally clean up pending files.
 
@@ -390,7 +826,6 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
             cleanup_files: If True, delete any pending files that were queued for upload
         """
         if cleanup_files:
-            import os
             for filepath in self._pending_files:
                 if os.path.exists(filepath):
                     os.remove(filepath)
@@ -398,169 +833,143 @@ class Jackbox:  # pylint: disable=too-many-instance-attributes
         self._pending_messages = []
         self._pending_files = []
 
-    def get_bot_messages(self, limit: int = 100):
+    def _bot_user_id(self) -> str:
+        """Return the user ID of this bot, calling auth.test only the first time."""
+        with Jackbox._shared_lock:
+            user_id = Jackbox._bot_user_ids.get(self._slack_workspace)
+        if user_id is None:
+            user_id = self.slack_client.auth_test()['user_id']
+            with Jackbox._shared_lock:
+                Jackbox._bot_user_ids[self._slack_workspace] = user_id
+        return user_id
+
+    @staticmethod
+    def _summarize_message(message: dict, thread_ts: str = None) -> dict:
+        text = message.get('text', '')
+        # Intro messages start with a section block holding *{game_name}* and have the gallery URL as text
+        title = None
+        for block in message.get('blocks') or []:
+            if block.get('type') == 'section':
+                match = re.fullmatch(r"\*(.+)\*", (block.get('text') or {}).get('text', ''))
+                title = match.group(1) if match else None
+                break
+        game = registry.parse_url(text)[0] if title and '/' in text else None
+        return {
+            'ts': message['ts'],
+            'text': text[:80] + ('...' if len(text) > 80 else ''),
+            'date': datetime.fromtimestamp(float(message['ts'])).strftime('%Y-%m-%d %H:%M:%S'),
+            'has_files': 'files' in message,
+            'file_ids': [file['id'] for file in message.get('files', []) if 'id' in file],
+            # Timestamp of the thread's parent message for replies, None for top-level messages
+            'thread_ts': thread_ts,
+            'reply_count': message.get('reply_count', 0),
+            # Whether the message or any reply in its thread has files; None unless replies were scanned
+            'thread_has_files': None,
+            # Game title and registry name of intro messages, None for other messages
+            'title': title,
+            'game': game.name if game else None,
+        }
+
+    def iter_bot_messages(self, oldest=None, latest=None, replies: bool = False):
+        """Stream the messages sent by this bot in the configured channel, newest first.
+
+        The channel history is paged through lazily, so only one page is held in memory at a time.
+
+        Args:
+            oldest: Only include messages after this datetime or epoch timestamp
+            latest: Only include messages before this datetime or epoch timestamp
+            replies: Also scan threads and yield the bot's replies right after their parent message.
+                Threads are fetched concurrently, up to the conversations.replies concurrency.
+
+        Yields:
+            Message dictionaries with 'ts', 'text', 'date', 'has_files', 'file_ids', 'thread_ts', 'reply_count',
+            'thread_has_files', 'title' and 'game' keys
+        """
+        bot_user_id = self._bot_user_id()
+        scanner = HistoryScanner(self.slack_client, self.slack_channel,
+                                 reply_workers=concurrency_for(self.config, 'conversations.replies'))
+        messages = scanner.messages(oldest=oldest, latest=latest)
+        if not replies:
+            messages = ((message, []) for message in messages)
+        else:
+            messages = scanner.with_replies(messages)
+        for message, thread in messages:
+            if message.get('user') == bot_user_id:
+                summary = self._summarize_message(message)
+                if replies:
+                    summary['thread_has_files'] = summary['has_files'] or any('files' in reply for reply in thread)
+                yield summary
+            for reply in thread:
+                if reply.get('user') == bot_user_id:
+                    yield self._summarize_message(reply, thread_ts=message['ts'])
+
+    def get_bot_messages(self, limit: int = 100, oldest=None, latest=None, replies: bool = False):
         """Get messages sent by this bot in the configured channel.
 
         Args:
-            limit: Maximum number of messages to retrieve (default 100)
+            limit: Maximum number of bot messages to retrieve (default 100); None retrieves all of them
+            oldest: Only include messages after this datetime or epoch timestamp
+            latest: Only include messages before this datetime or epoch timestamp
+            replies: Also include the bot's replies in threads
 
         Returns:
-            List of message dictionaries with 'ts', 'text', 'date' keys
+            List of message dictionaries, see iter_bot_messages
         """
         if not self.slack_client:
             print("ERROR: No Slack client configured")
             return []
 
         try:
-            # Get bot's own user ID
-            auth_response = self.slack_client.auth_test()
-            bot_user_id = auth_response['user_id']
-
-            # Get conversation history
-            response = self.slack_client.conversations_history(
-                channel=self.slack_channel,
-                limit=limit
-            )
-
-            bot_messages = []
-            for message in response.get('messages', []):
-                # Filter to only bot's messages (check user or bot_id)
-                if message.get('user') == bot_user_id or message.get('bot_id'):
-                    # Only include if it's from our bot
-                    if message.get('user') == bot_user_id:
-                        from datetime import datetime
-                        ts = float(message['ts'])
-                        date_str = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
-
-                        # Get preview text (first 80 chars)
-                        text = message.get('text', '')[:80]
-                        if len(message.get('text', '')) > 80:
-                            text += '...'
-
-                        bot_messages.append({
-                            'ts': message['ts'],
-                            'text': text,
-                            'date': date_str,
-                            'has_files': 'files' in message
-                        })
-
-            return bot_messages
-
+            return list(islice(self.iter_bot_messages(oldest=oldest, latest=latest, replies=replies), limit))
         except Exception as ex:
             print(f"ERROR: Failed to get messages: {ex}")
+            self._check_channel_error(ex)
             return []
 
-    def delete_messages(self, timestamps: list):
+    def delete_messages(self, timestamps: list, threads: bool = True):
         """Delete messages by their timestamps.
 
+        Deletions run concurrently, paced by the chat.delete and files.delete rate limits. Replies
+        and files of other users in the bot's threads are left alone, and messages the bot may not
+        delete are skipped rather than counted as failures.
+
         Args:
-            timestamps: List of message timestamps to delete
+            timestamps: List of message timestamps to delete, or message dicts from iter_bot_messages,
+                whose reply_count spares reading threads that have no replies
+            threads: Also delete every reply in the threads started by these messages and the files
+                uploaded to them, e.g. the whole thread of a game from its intro message
 
         Returns:
-            Tuple of (success_count, failure_count)
+            Tuple of (success_count, failure_count), counting messages and files
         """
         if not self.slack_client:
             print("ERROR: No Slack client configured")
             return (0, 0)
 
-        success = 0
-        failed = 0
-
-        for ts in timestamps:
-            try:
-                self.slack_client.chat_delete(
-                    channel=self.slack_channel,
-                    ts=ts
-                )
-                success += 1
-            except Exception as ex:
-                print(f"ERROR: Failed to delete message {ts}: {ex}")
-                failed += 1
+        deleter = BulkDeleter(self.slack_client, self.slack_channel, concurrency_for(self.config, 'chat.delete'),
+                              journal=self.journal, user=self._bot_user_id())
+        progress = deleter.delete(timestamps, threads=threads)
+        return (progress.deleted, progress.failed)
 
-        return (success, failed)
+    @classmethod
+    def message_manager(cls, api_account: str = 'dev'):
+        """Create a minimal instance just for message management, connected to the account's channel."""
+        instance = cls.__new__(cls)
+        instance.dry_run = False
+        instance.api_account = api_account
+        instance.config = cls.load_config(api_account)
+        instance._connect_slack(instance.config)
+        instance.journal = None
+        if instance.config.get('delivery_journal', True):
+            instance.journal = DeliveryJournal(f"{cache_dir(instance.config)}/journal.sqlite")
+        return instance
 
     @classmethod
-    def manage_messages(cls, api_account: str = 'dev'):
+    def manage_messages(cls, api_account: str = 'dev', limit: int = 50):
         """Interactive message management - list and delete bot messages.
 
         Args:
             api_account: API account key from config
+            limit: Maximum number of bot messages to list, however far back in the channel they are
         """
-        # Create a minimal instance just for message management
-        instance = cls.__new__(cls)
-        instance.dry_run = False
-        instance.api_account = api_account
-
-        config_file = f'{str(Path.home())}/.config/jackbot/config.json'
-        try:
-            with open(config_file) as file:
-                config_json = json.loads(file.read())
-        except FileNotFoundError as _fe:
-            sys.exit(f"ERROR: config file not found {config_file}:\n\t{_fe}")
-        except json.decoder.JSONDecodeError as _je:
-            sys.exit(f"ERROR: invalid config file format {config_file}:\n\t{_je}")
-
-        if api_account in config_json:
-            config = config_json[api_account]
-        else:
-            sys.exit(f"API account not defined: {api_account}")
-
-        instance.slack_client = WebClient(token=config['slack_token'])
-        # Use slack_channel_id if set, otherwise resolve slack_channel name to ID
-        if config.get('slack_channel_id'):
-            instance.slack_channel = config['slack_channel_id']
-            print(f"Using configured channel ID: {instance.slack_channel}")
-        else:
-            instance.slack_channel = instance._resolve_channel_id(config['slack_channel'])
-
-        print(f"\nFetching messages from channel...")
-        messages = instance.get_bot_messages(limit=50)
-
-        if not messages:
-            print("No bot messages found in channel.")
-            return
-
-        print(f"\nFound {len(messages)} bot messages:\n")
-        print("-" * 80)
-        for i, msg in enumerate(messages):
-            file_indicator = " [FILE]" if msg['has_files'] else ""
-            print(f"  [{i+1}] {msg['date']}{file_indicator}")
-            print(f"      {msg['text']}")
-            print()
-
-        print("-" * 80)
-        print("\nEnter message numbers to delete (comma-separated), 'all' to delete all, or 'q' to quit:")
-        selection = input("> ").strip().lower()
-
-        if selection == 'q' or selection == '':
-            print("Cancelled.")
-            return
-
-        timestamps_to_delete = []
-        if selection == 'all':
-            timestamps_to_delete = [msg['ts'] for msg in messages]
-        else:
-            try:
-                indices = [int(x.strip()) - 1 for x in selection.split(',')]
-                for idx in indices:
-                    if 0 <= idx < len(messages):
-                        timestamps_to_delete.append(messages[idx]['ts'])
-                    else:
-                        print(f"Warning: Invalid index {idx + 1}, skipping")
-            except ValueError:
-                print("Invalid input. Please enter numbers separated by commas.")
-                return
-
-        if not timestamps_to_delete:
-            print("No valid messages selected.")
-            return
-
-        print(f"\nAbout to delete {len(timestamps_to_delete)} message(s). Continue? (y/n)")
-        confirm = input("> ").strip().lower()
-
-        if confirm != 'y':
-            print("Cancelled.")
-            return
-
-        success, failed = instance.delete_messages(timestamps_to_delete)
-        print(f"\nDeleted {success} message(s), {failed} failed.")
+        bot_messages.manage_messages(cls.message_manager(api_account), limit=limit)
@@ -4,8 +4,8 @@ from jackbox import Jackbox
 
 class Brk(Jackbox):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
         self.ext = 'png'
 
         self.data_url = self.gallery_url = self.base_image_url = self.base_gen_image_url = 'BRKGame'
@@ -19,20 +19,33 @@ class Brk(Jackbox):
                 # Queue intro message first
                 self.queue_intro_message()
 
+                jobs = []
                 for bracket_num in data['bracketData']:
                     bracket = data['bracketData'][bracket_num]
                     for index, _ in enumerate(bracket['matchups']):
                         title = f"{bracket['content']['prompt']['text']} {index}"
-                        filename = f"{self.clean_string(title)}.{self.ext}"
-                        if self.generate_images(f"{bracket_num}_{index}", filename):
-                            initial_comment = f"*{title}*"
-                            self.queue_file_upload(
-                                file=filename,
-                                title=title,
-                                initial_comment=initial_comment
-                            )
-                        else:
-                            raise Exception(f"Failed to generate image for bracket {bracket_num} matchup {index}")
+                        jobs.append({
+                            'bracket_num': bracket_num,
+                            'index': index,
+                            'title': title,
+                            'filename': f"{self.clean_string(title)}.{self.ext}",
+                        })
+                results = self.generate_images_concurrently(
+                    [{'index': f"{job['bracket_num']}_{job['index']}", 'filename': job['filename']} for job in jobs]
+                )
+
+                for job, result in zip(jobs, results):
+                    if result:
+                        initial_comment = f"*{job['title']}*"
+                        self.queue_file_upload(
+                            file=job['filename'],
+                            title=job['title'],
+                            initial_comment=initial_comment
+                        )
+                    else:
+                        raise Exception(
+                            f"Failed to generate image for bracket {job['bracket_num']} matchup {job['index']}"
+                        )
 
                 # All messages prepared successfully, send them
                 self.send_queued_messages()
@@ -3,5 +3,5 @@ from jackbox.overdrawn import Overdrawn
 
 class Civicdoodle(Overdrawn):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
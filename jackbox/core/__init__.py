@@ -0,0 +1 @@
+"""Shared plumbing used by the Jackbox game modules (HTTP, rendering, caching, Slack)."""
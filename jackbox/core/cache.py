@@ -0,0 +1,275 @@
+"""Persistent on-disk caches shared between jackbot runs."""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = f"{str(Path.home())}/.cache/jackbot"
+
+
+def cache_dir(config: dict) -> str:
+    """Return the cache root configured for an account."""
+    return os.path.expanduser(config.get('cache_dir', DEFAULT_CACHE_DIR))
+
+
+def digest(*parts) -> str:
+    """Return a hex SHA-256 digest of the given str/bytes parts."""
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part if isinstance(part, bytes) else str(part).encode())
+        sha.update(b'\0')
+    return sha.hexdigest()
+
+
+class FileCache:
+    """A size-bounded directory of files keyed by digest, evicting the least recently used entries.
+
+    The entries on disk are indexed in memory on first use, least recently used first, so
+    lookups and evictions do not walk the directory again.
+
+    Args:
+        directory: Directory holding the cached files
+        max_bytes: Total size above which the oldest entries are evicted
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # key -> size of every entry, least recently used first; None until first used
+        self._index = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached entries in bytes."""
+        with self._lock:
+            self._load()
+            return self._size
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key: str, dest: str) -> bool:
+        """Copy the entry for key to dest. Returns False (a miss) if there is no such entry."""
+        path = self.path(key)
+        try:
+            # Refresh the access time, which orders the index the next time the cache is opened
+            os.utime(path)
+            _link_or_copy(path, dest)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                if self._index is not None and key in self._index:
+                    self._size -= self._index.pop(key)
+            return False
+        with self._lock:
+            self.hits += 1
+            self._load()
+            self._size += size - self._index.pop(key, 0)
+            self._index[key] = size
+        return True
+
+    def put(self, key: str, src: str):
+        """Store src under key, evicting old entries if the cache grows too large."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+        os.close(handle)
+        try:
+            # Files are only ever replaced, never modified in place, so sharing an inode is safe
+            _link_or_copy(src, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self._load()
+            # Replacing an entry frees the space of the old one
+            self._size += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self._evict()
+
+    def _load(self):
+        """Index the entries on disk, least recently used first. Called with the lock held."""
+        if self._index is not None:
+            return
+        self._index = OrderedDict(
+            (os.path.basename(path), size) for _, size, path in sorted(self._entries())
+        )
+        self._size = sum(self._index.values())
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.part'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits. Called with the lock held."""
+        while self._size > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+    def stats(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses"
+
+
+def _link_or_copy(src: str, dest: str):
+    """Hard-link src to dest, falling back to a copy across filesystems."""
+    if os.path.exists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+class ArtifactStore:
+    """Local copies of fishery artifact JSON, keyed by game category and game id.
+
+    Each artifact is stored next to a small metadata file holding the validators
+    (ETag / Last-Modified) needed to revalidate it.
+
+    Args:
+        directory: Directory holding the stored artifacts
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, category: str, game_id: str) -> str:
+        return os.path.join(self.directory, category, f"{game_id}.json")
+
+    def load(self, category: str, game_id: str):
+        """Return (body, metadata) for a stored artifact, or (None, None) if there is none."""
+        path = self.path(category, game_id)
+        try:
+            with open(path, 'rb') as file:
+                body = file.read()
+            with open(f"{path}.meta", encoding='utf-8') as file:
+                metadata = json.loads(file.read())
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return None, None
+        return body, metadata
+
+    def save(self, category: str, game_id: str, body: bytes, headers: dict):
+        """Store an artifact body along with the validators from its response headers."""
+        path = self.path(category, game_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        metadata = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored': time.time(),
+        }
+        _write_atomic(path, body)
+        _write_atomic(f"{path}.meta", json.dumps(metadata).encode())
+
+
+def _write_atomic(path: str, data: bytes):
+    handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+    with os.fdopen(handle, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+class ChannelIndex:
+    """Slack channel name to ID mappings, persisted as one JSON file shared by every account.
+
+    Mappings are grouped by workspace (a digest of the bot token) and each workspace is
+    indexed as a whole, so one paged conversations.list pass resolves every channel in it.
+
+    Args:
+        path: JSON file holding the index
+        ttl: Seconds after which a workspace's mappings are refreshed
+    """
+    _refreshing = set()
+    _refreshing_lock = threading.Lock()
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                return json.loads(file.read())
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return {}
+
+    def lookup(self, workspace: str, name: str):
+        """Return (channel_id, stale) for a channel name, or (None, False) if it is not indexed."""
+        entry = self._read().get(workspace)
+        if not entry or name not in entry['channels']:
+            return None, False
+        return entry['channels'][name], time.time() - entry['updated'] > self.ttl
+
+    def store(self, workspace: str, channels: dict):
+        """Replace the mappings of a workspace with a freshly listed {name: id} dict."""
+        with self._lock:
+            index = self._read()
+            index[workspace] = {'updated': time.time(), 'channels': channels}
+            self._write(index)
+
+    def invalidate(self, workspace: str, name: str):
+        """Forget a channel, e.g. after Slack reported it as not found."""
+        with self._lock:
+            index = self._read()
+            if name in index.get(workspace, {}).get('channels', {}):
+                del index[workspace]['channels'][name]
+                self._write(index)
+
+    def refresh(self, workspace: str, list_channels, background: bool = False):
+        """Index a workspace with list_channels(), a callable returning {name: id}.
+
+        A background refresh runs in a daemon thread and is skipped while another refresh
+        of the same workspace is in progress.
+
+        Returns:
+            The new mappings, or None for a background refresh
+        """
+        if not background:
+            channels = list_channels()
+            self.store(workspace, channels)
+            return channels
+
+        with self._refreshing_lock:
+            if workspace in self._refreshing:
+                return None
+            self._refreshing.add(workspace)
+
+        def run():
+            try:
+                self.store(workspace, list_channels())
+            except Exception as ex:  # pylint: disable=broad-except
+                print(f"WARNING: Failed to refresh the Slack channel index: {ex}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(workspace)
+
+        threading.Thread(target=run, name='channel-index-refresh', daemon=True).start()
+        return None
+
+    def _write(self, index: dict):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _write_atomic(self.path, json.dumps(index).encode())
@@ -0,0 +1,186 @@
+"""Bulk deletion of bot messages, their threads and the files uploaded to them."""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from slack_sdk.errors import SlackApiError
+
+from jackbox.core.history import HistoryScanner
+
+# Errors meaning the message or file is already gone
+_ALREADY_DELETED = {'message_not_found', 'file_not_found', 'file_deleted'}
+# Errors meaning the message or file belongs to someone else, so the bot may not delete it
+_NOT_DELETABLE = {'cant_delete_message', 'cant_delete_file'}
+
+
+class DeleteProgress:
+    """Thread-safe counter of deletions that prints progress and throughput every few seconds.
+
+    Every attempt ends up deleted, skipped (not the bot's to delete) or failed.
+
+    Args:
+        total: Number of deletions that will be attempted
+        interval: Minimum number of seconds between progress lines
+    """
+
+    def __init__(self, total: int, interval: float = 2.0):
+        self.total = total
+        self.interval = interval
+        self._counts = Counter()
+        self.started = time.monotonic()
+        self._reported = self.started
+        self._lock = threading.Lock()
+
+    @property
+    def deleted(self) -> int:
+        return self._counts['deleted']
+
+    @property
+    def skipped(self) -> int:
+        return self._counts['skipped']
+
+    @property
+    def failed(self) -> int:
+        return self._counts['failed']
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.deleted / elapsed if elapsed else 0.0
+
+    def add(self, outcome: str):
+        """Count one attempt, given as 'deleted', 'skipped' or 'failed'."""
+        with self._lock:
+            self._counts[outcome] += 1
+            now = time.monotonic()
+            if now - self._reported < self.interval:
+                return
+            self._reported = now
+            done = self._counts.total()
+        print(f"INFO: Deleted {done}/{self.total} ({self.rate:.1f}/s)")
+
+
+class BulkDeleter:
+    """Delete many messages concurrently, expanding each one to its whole thread and uploaded files.
+
+    Every call goes through the client, so a SlackDispatcher keeps chat.delete, files.delete and
+    conversations.replies within their rate limits while up to ``concurrency`` calls are in flight.
+
+    Args:
+        client: Slack client (normally a SlackDispatcher)
+        channel: Channel ID
+        concurrency: Maximum number of API calls in flight
+        journal: DeliveryJournal to forget games in once their intro message is deleted, so they
+            are posted again in full instead of resumed
+        user: User ID of the bot; replies and files of other users in its threads are left alone
+    """
+
+    def __init__(self, client, channel: str, concurrency: int = 4, journal=None, user: str = None):
+        self.client = client
+        self.channel = channel
+        self.concurrency = max(1, concurrency)
+        self.journal = journal
+        self.user = user
+
+    def _owned(self, message: dict) -> bool:
+        return self.user is None or message.get('user') == self.user
+
+    def _read_threads(self, timestamps: list):
+        """Yield (ts, thread) for the given messages, reading their threads concurrently."""
+        scanner = HistoryScanner(self.client, self.channel)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(scanner.thread, ts): ts for ts in dict.fromkeys(timestamps)}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except SlackApiError as ex:
+                    print(f"WARNING: Failed to read thread {futures[future]}, deleting the message only: {ex}")
+                    yield futures[future], []
+
+    def expand(self, messages) -> tuple:
+        """Return (message timestamps, file ids) of the threads started by the given messages.
+
+        Replies come before the messages that started their thread, so an interrupted run does not
+        leave orphaned replies behind.
+
+        Args:
+            messages: Timestamps, or message dicts from Jackbox.iter_bot_messages. The thread of a
+                message dict is only read when its reply_count says it has replies.
+        """
+        replies = []
+        parents = []
+        files = []
+        unread = []
+        for message in messages:
+            if not isinstance(message, dict):
+                unread.append(message)
+            elif message['thread_ts'] or not message['reply_count']:
+                (replies if message['thread_ts'] else parents).append(message['ts'])
+                files.extend(message['file_ids'])
+            else:
+                unread.append(message['ts'])
+        for ts, thread in self._read_threads(unread):
+            if thread and thread[0]['ts'] != ts:
+                # A reply: conversations.replies returned the thread it is in, delete only the reply
+                thread = [message for message in thread if message['ts'] == ts]
+                replies.append(ts)
+            else:
+                parents.append(ts)
+            for message in filter(self._owned, thread):
+                files.extend(file['id'] for file in message.get('files', []) if 'id' in file)
+                if message['ts'] != ts:
+                    replies.append(message['ts'])
+        return list(dict.fromkeys(replies + parents)), list(dict.fromkeys(files))
+
+    def _delete(self, method, **kwargs) -> str:
+        """Call a delete method. Returns 'deleted', 'skipped' or 'failed'."""
+        try:
+            method(**kwargs)
+            return 'deleted'
+        except SlackApiError as ex:
+            error = ex.response.get('error')
+            if error in _ALREADY_DELETED:
+                return 'deleted'
+            if error in _NOT_DELETABLE:
+                print(f"WARNING: Skipped {kwargs.get('ts') or kwargs.get('file')}: {error}")
+                return 'skipped'
+            print(f"ERROR: Failed to delete {kwargs.get('ts') or kwargs.get('file')}: {error}")
+        except Exception as ex:
+            print(f"ERROR: Failed to delete {kwargs.get('ts') or kwargs.get('file')}: {ex}")
+        return 'failed'
+
+    def _delete_message(self, ts: str) -> str:
+        outcome = self._delete(self.client.chat_delete, channel=self.channel, ts=ts)
+        if outcome == 'deleted' and self.journal is not None:
+            for game in self.journal.forget_thread(self.channel, ts):
+                print(f"INFO: Forgot the deliveries of {game}")
+        return outcome
+
+    def delete(self, messages, threads: bool = True) -> DeleteProgress:
+        """Delete messages, and with threads also every reply to them and the files they share.
+
+        Args:
+            messages: Timestamps of the messages to delete, or message dicts from Jackbox.iter_bot_messages
+            threads: Expand each message to its thread and uploaded files
+
+        Returns:
+            DeleteProgress with the final counts
+        """
+        files = []
+        if threads:
+            timestamps, files = self.expand(messages)
+        else:
+            timestamps = list(dict.fromkeys(
+                message['ts'] if isinstance(message, dict) else message for message in messages
+            ))
+        progress = DeleteProgress(len(timestamps) + len(files))
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._delete, self.client.files_delete, file=file_id) for file_id in files]
+            futures += [executor.submit(self._delete_message, ts) for ts in timestamps]
+            for future in as_completed(futures):
+                progress.add(future.result())
+        elapsed = time.monotonic() - progress.started
+        print(f"INFO: Deleted {progress.deleted} of {progress.total} messages and files in {elapsed:.1f}s "
+              f"({progress.rate:.1f}/s), {progress.skipped} skipped, {progress.failed} failed")
+        return progress
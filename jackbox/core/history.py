@@ -0,0 +1,82 @@
+"""Lazy, paginated scans of a Slack channel's message history."""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+def slack_ts(value) -> str | None:
+    """Return a Slack timestamp string for a datetime, epoch seconds or ts string."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = value.timestamp()
+    return f"{float(value):.6f}"
+
+
+class HistoryScanner:
+    """Stream the messages of a channel, following ``next_cursor`` one page at a time.
+
+    Only one page of messages (plus the replies of a bounded number of threads) is held in
+    memory at once, so channels with years of history can be scanned.
+
+    Args:
+        client: Slack client (normally a SlackDispatcher, which paces the calls)
+        channel: Channel ID
+        page_size: Messages requested per conversations.history / conversations.replies call
+        reply_workers: Threads whose replies are fetched concurrently
+    """
+
+    def __init__(self, client, channel: str, page_size: int = 200, reply_workers: int = 4):
+        self.client = client
+        self.channel = channel
+        self.page_size = page_size
+        self.reply_workers = max(1, reply_workers)
+
+    def _pages(self, method, **kwargs):
+        cursor = None
+        while True:
+            response = method(channel=self.channel, limit=self.page_size, cursor=cursor, **kwargs)
+            yield response.get('messages', [])
+            cursor = response.get('response_metadata', {}).get('next_cursor')
+            if not cursor or not response.get('has_more', True):
+                return
+
+    def messages(self, oldest=None, latest=None):
+        """Yield top-level messages, newest first, optionally limited to a date range."""
+        kwargs = {}
+        if oldest is not None:
+            kwargs['oldest'] = slack_ts(oldest)
+        if latest is not None:
+            kwargs['latest'] = slack_ts(latest)
+        for page in self._pages(self.client.conversations_history, **kwargs):
+            yield from page
+
+    def thread(self, thread_ts: str) -> list:
+        """Return every message in a thread, oldest first, starting with the parent message."""
+        return [message for page in self._pages(self.client.conversations_replies, ts=thread_ts) for message in page]
+
+    def replies(self, thread_ts: str) -> list:
+        """Return every reply in a thread, oldest first, without the parent message."""
+        return [message for message in self.thread(thread_ts) if message['ts'] != thread_ts]
+
+    def with_replies(self, messages):
+        """Yield (message, replies) for every message, fetching thread replies concurrently.
+
+        Replies are fetched for up to twice reply_workers upcoming threads while earlier results are
+        consumed, and results are yielded in the order of messages. At most page_size messages are
+        held back waiting for a thread ahead of them.
+        """
+        window = deque()
+        pending = 0
+        with ThreadPoolExecutor(max_workers=self.reply_workers) as executor:
+            for message in messages:
+                future = executor.submit(self.replies, message['ts']) if message.get('reply_count') else None
+                window.append((message, future))
+                pending += future is not None
+                while window and (window[0][1] is None or window[0][1].done()
+                                  or pending > self.reply_workers * 2 or len(window) > self.page_size):
+                    message, future = window.popleft()
+                    pending -= future is not None
+                    yield message, future.result() if future else []
+            for message, future in window:
+                yield message, future.result() if future else []
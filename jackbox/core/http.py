@@ -0,0 +1,116 @@
+"""Connection-pooled HTTP transport shared by every game module."""
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_HOSTS = 4
+DEFAULT_POOL_MAXSIZE = 8
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_DOWNLOAD = 100 * 1024 * 1024
+
+
+class DownloadTooLarge(Exception):
+    """Raised when a download exceeds the configured maximum size."""
+
+
+class HttpClient:
+    """A keep-alive ``requests.Session`` with bounded per-host connection pools.
+
+    Args:
+        pool_hosts: Number of distinct hosts to keep a connection pool for
+        pool_maxsize: Maximum number of open connections per host
+        connect_timeout: Seconds to wait for a connection to be established
+        read_timeout: Seconds to wait between bytes received from the server
+    """
+
+    def __init__(self, pool_hosts: int = DEFAULT_POOL_HOSTS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, read_timeout: float = DEFAULT_READ_TIMEOUT):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        # pool_block makes pool_maxsize a hard per-host limit instead of opening throwaway connections
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_maxsize, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Build a client from the ``http_*`` keys of an account config."""
+        return cls(
+            pool_hosts=int(config.get('http_pool_hosts', DEFAULT_POOL_HOSTS)),
+            pool_maxsize=int(config.get('http_pool_maxsize', DEFAULT_POOL_MAXSIZE)),
+            connect_timeout=float(config.get('http_connect_timeout', DEFAULT_CONNECT_TIMEOUT)),
+            read_timeout=float(config.get('http_read_timeout', DEFAULT_READ_TIMEOUT)),
+        )
+
+    def get(self, url: str, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def stream_to_file(response, filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   max_bytes: int = DEFAULT_MAX_DOWNLOAD):
+    """Write a streamed response body to filename in fixed-size chunks.
+
+    The body goes to a temporary file in the same directory that replaces filename only once
+    it is complete, so readers never observe a partial file.
+
+    Args:
+        response: A ``requests.Response`` obtained with ``stream=True``
+        filename: Destination path
+        chunk_size: Number of bytes read and written at a time
+        max_bytes: Size above which the download is aborted with DownloadTooLarge
+
+    Returns:
+        Tuple of (bytes written, seconds taken)
+    """
+    declared = response.headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise DownloadTooLarge(f"{response.url} is {int(declared)} bytes, limit is {max_bytes}")
+
+    started = time.monotonic()
+    written = 0
+    handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), suffix='.part')
+    try:
+        with os.fdopen(handle, 'wb') as file_handle:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise DownloadTooLarge(f"{response.url} exceeded the {max_bytes} byte limit")
+                file_handle.write(chunk)
+        os.replace(tmp_path, filename)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written, time.monotonic() - started
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(config: dict) -> HttpClient:
+    """Return the process-wide client for the given pool settings, creating it on first use.
+
+    Game instances that share settings share connections, so the TCP/TLS handshake
+    to fishery and S3 is paid once per host per process.
+    """
+    key = tuple(config.get(name) for name in (
+        'http_pool_hosts', 'http_pool_maxsize', 'http_connect_timeout', 'http_read_timeout'
+    ))
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = HttpClient.from_config(config)
+        return _clients[key]
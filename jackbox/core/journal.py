@@ -0,0 +1,76 @@
+"""Delivery journal: which messages of a game have already been posted to Slack."""
+import os
+import sqlite3
+import threading
+import time
+
+
+class DeliveryJournal:
+    """Record delivered Slack messages per game and channel in a SQLite database.
+
+    Every queued message is identified by a key derived from its position in the queue, its
+    type and its content, so a rerun of a game that failed halfway can skip what was already
+    posted and continue in the same thread.
+
+    Args:
+        path: SQLite database file
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS deliveries ("
+            " game TEXT NOT NULL,"
+            " channel TEXT NOT NULL,"
+            " message_key TEXT NOT NULL,"
+            " type TEXT NOT NULL,"
+            " file TEXT,"
+            " ts TEXT,"
+            " delivered REAL NOT NULL,"
+            " PRIMARY KEY (game, channel, message_key))"
+        )
+
+    def delivered(self, game: str, channel: str) -> dict:
+        """Return {message_key: (type, file, ts)} for the messages already delivered for a game."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message_key, type, file, ts FROM deliveries WHERE game = ? AND channel = ?",
+                (game, channel),
+            ).fetchall()
+        return {key: (kind, file, ts) for key, kind, file, ts in rows}
+
+    def record(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self, game: str, channel: str, message_key: str, kind: str, file: str = None, ts: str = None):
+        """Mark a message as delivered."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO deliveries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (game, channel, message_key, kind, file, ts, time.time()),
+            )
+
+    def forget(self, game: str, channel: str):
+        """Drop every delivery recorded for a game, e.g. before posting it again from scratch."""
+        with self._lock:
+            self._conn.execute("DELETE FROM deliveries WHERE game = ? AND channel = ?", (game, channel))
+
+    def forget_thread(self, channel: str, ts: str) -> list:
+        """Drop every delivery of the game whose intro message is ts, after that message was deleted.
+
+        Returns:
+            The games that were forgotten (empty if ts is not the intro message of a recorded game)
+        """
+        with self._lock:
+            games = [game for game, in self._conn.execute(
+                "SELECT DISTINCT game FROM deliveries WHERE channel = ? AND ts = ? AND type = 'intro_message'",
+                (channel, ts),
+            )]
+            for game in games:
+                self._conn.execute("DELETE FROM deliveries WHERE game = ? AND channel = ?", (game, channel))
+        return games
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
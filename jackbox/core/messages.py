@@ -0,0 +1,136 @@
+"""Message management: list, prune and delete the bot's messages in an account's channel.
+
+The functions take the instance created by Jackbox.message_manager for the account.
+"""
+import re
+import time
+from itertools import islice
+
+from jackbox.core import registry
+
+
+def message_filter(game: str = None, has_files: bool = False):
+    """Return a predicate selecting top-level bot messages (as returned by iter_bot_messages) for pruning.
+
+    Args:
+        game: Only select intro messages of this game, given as a game name (``drawful``), artifact category
+            or the title shown in the channel (``Champ'd UP``), in any case
+        has_files: Only select messages whose thread has uploaded files
+    """
+    wanted = registry.find(game) if game else None
+    wanted_title = re.sub(r"\W", "", game).lower() if game else None
+
+    def matches(message):
+        if message['thread_ts']:
+            return False
+        if game and not ((wanted and message['game'] == wanted.name)
+                         or re.sub(r"\W", "", message['title'] or '').lower() == wanted_title):
+            return False
+        return not has_files or bool(message['thread_has_files'])
+    return matches
+
+
+def prune_messages(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        instance, older_than: float = None, game: str = None, has_files: bool = False,
+        limit: int = None, dry_run: bool = False):
+    """Non-interactive message management - delete the bot messages matching the filters.
+
+    Selected messages are deleted with their whole thread, so selecting intro messages removes whole games.
+
+    Args:
+        instance: Jackbox instance from Jackbox.message_manager
+        older_than: Only delete messages older than this many days
+        game: Only delete games of this game name, artifact category or title
+        has_files: Only delete messages whose thread has uploaded files
+        limit: Maximum number of messages to delete, newest first
+        dry_run: Only report the messages that would be deleted
+
+    Returns:
+        Tuple of (success_count, failure_count); (0, 0) in dry-run mode
+    """
+    if not instance.slack_client:
+        print("ERROR: No Slack client configured")
+        return (0, 0)
+
+    matches = message_filter(game=game, has_files=has_files)
+    latest = time.time() - older_than * 86400 if older_than is not None else None
+    selected = []
+    try:
+        for message in islice(filter(matches, instance.iter_bot_messages(latest=latest, replies=has_files)), limit):
+            selected.append(message)
+            file_indicator = " [FILE]" if message['has_files'] or message['thread_has_files'] else ""
+            replies = f" ({message['reply_count']} replies)" if message['reply_count'] else ""
+            print(f"  {message['date']} {message['title'] or message['text']}{file_indicator}{replies}")
+    except Exception as ex:
+        print(f"ERROR: Failed to get messages: {ex}")
+        instance._check_channel_error(ex)  # pylint: disable=protected-access
+        return (0, 1)
+
+    print(f"INFO: {len(selected)} message(s) match")
+    if dry_run:
+        print("INFO: Dry run, nothing was deleted")
+        return (0, 0)
+    if not selected:
+        return (0, 0)
+    return instance.delete_messages(selected)
+
+
+def manage_messages(instance, limit: int = 50):
+    """Interactive message management - list and delete bot messages.
+
+    Args:
+        instance: Jackbox instance from Jackbox.message_manager
+        limit: Maximum number of bot messages to list, however far back in the channel they are
+    """
+    print("\nFetching messages from channel...")
+    messages = instance.get_bot_messages(limit=limit, replies=True)
+
+    if not messages:
+        print("No bot messages found in channel.")
+        return
+
+    print(f"\nFound {len(messages)} bot messages:\n")
+    print("-" * 80)
+    for i, msg in enumerate(messages):
+        file_indicator = " [FILE]" if msg['has_files'] else ""
+        indent = "    " if msg['thread_ts'] else ""
+        print(f"  {indent}[{i+1}] {msg['date']}{file_indicator}")
+        print(f"      {indent}{msg['text']}")
+        print()
+
+    print("-" * 80)
+    print("\nEnter message numbers to delete (comma-separated), 'all' to delete all, or 'q' to quit:")
+    selection = input("> ").strip().lower()
+
+    if selection in ('q', ''):
+        print("Cancelled.")
+        return
+
+    messages_to_delete = []
+    if selection == 'all':
+        messages_to_delete = list(messages)
+    else:
+        try:
+            indices = [int(x.strip()) - 1 for x in selection.split(',')]
+            for idx in indices:
+                if 0 <= idx < len(messages):
+                    messages_to_delete.append(messages[idx])
+                else:
+                    print(f"Warning: Invalid index {idx + 1}, skipping")
+        except ValueError:
+            print("Invalid input. Please enter numbers separated by commas.")
+            return
+
+    if not messages_to_delete:
+        print("No valid messages selected.")
+        return
+
+    print(f"\nAbout to delete {len(messages_to_delete)} message(s) with their threads and files. Continue? (y/n)")
+    confirm = input("> ").strip().lower()
+
+    if confirm != 'y':
+        print("Cancelled.")
+        return
+
+    success, failed = instance.delete_messages(messages_to_delete)
+    print(f"\nDeleted {success} message(s) and file(s), {failed} failed.")
@@ -0,0 +1,200 @@
+"""Counters and histograms in the Prometheus text format, exported to a file or a local port.
+
+Every metric jackbot collects is defined at the bottom of this module. They are always collected;
+nothing is exported until configure() is given a textfile (for node_exporter's textfile collector)
+or a port to serve ``/metrics`` on.
+"""
+import atexit
+import os
+import tempfile
+import threading
+
+# Upper bounds of the histogram buckets, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_metrics = []
+_textfile = None  # pylint: disable=invalid-name
+_server = None  # pylint: disable=invalid-name
+
+
+class Counter:
+    """Monotonically increasing value per combination of label values.
+
+    Args:
+        name: Metric name, ending in ``_total``
+        documentation: Help text
+        labels: Label names
+    """
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+        if not labels:
+            # A metric without labels has exactly one series, reported from the start
+            self._values[()] = self._zero()
+        _metrics.append(self)
+
+    def _zero(self):
+        return 0
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        """Yield (sample name, labels, value) for every series."""
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labels, key)), value
+
+
+class Histogram(Counter):
+    """Distribution of observed values per combination of label values.
+
+    Args:
+        name: Metric name
+        documentation: Help text
+        labels: Label names
+        buckets: Upper bounds of the buckets, ascending
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DURATION_BUCKETS):
+        self.buckets = buckets
+        super().__init__(name, documentation, labels)
+
+    def _zero(self):
+        return [0] * len(self.buckets), 0, 0.0
+
+    def inc(self, amount: float = 1, **labels):
+        raise TypeError(f"{self.name} is a histogram, use observe()")
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            buckets, count, total = self._values.get(key) or self._zero()
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    buckets[position] += 1
+            self._values[key] = (buckets, count + 1, total + value)
+
+    def samples(self):
+        with self._lock:
+            values = {key: (list(buckets), count, total) for key, (buckets, count, total) in self._values.items()}
+        for key, (buckets, count, total) in sorted(values.items()):
+            labels = dict(zip(self.labels, key))
+            for bound, bucket_count in zip(self.buckets, buckets):
+                yield f"{self.name}_bucket", {**labels, 'le': f"{bound:g}"}, bucket_count
+            yield f"{self.name}_bucket", {**labels, 'le': '+Inf'}, count
+            yield f"{self.name}_count", labels, count
+            yield f"{self.name}_sum", labels, total
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def exposition() -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            label_text = ','.join(f'{label}="{_escape(value)}"' for label, value in labels.items())
+            lines.append(f"{name}{{{label_text}}} {_format(value)}" if label_text else f"{name} {_format(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(path: str):
+    """Write every metric to path, replacing it atomically as the textfile collector requires."""
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, tmp_path = tempfile.mkstemp(dir=directory, prefix='.jackbot-', suffix='.prom')
+    try:
+        with os.fdopen(handle, 'w') as file:
+            file.write(exposition())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _serve(port: int):
+    """Serve the metrics on 127.0.0.1:port in a daemon thread."""
+    # Imported here so runs that do not serve metrics do not pay for http.server at start-up
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # pylint: disable=import-outside-toplevel
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # pylint: disable=invalid-name
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = exposition().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    print(f"INFO: Serving metrics on http://127.0.0.1:{server.server_address[1]}/metrics")
+    return server
+
+
+def configure(textfile: str = None, port: int = None):
+    """Export the metrics to a textfile, written by flush() and at exit, and/or serve them on 127.0.0.1:port."""
+    global _textfile, _server  # pylint: disable=global-statement
+    _textfile = textfile
+    if textfile:
+        atexit.register(flush)
+    if port is not None and _server is None:
+        _server = _serve(port)
+
+
+def flush():
+    """Write the textfile, if one is configured. Long-running modes call this after every game."""
+    if _textfile:
+        try:
+            write_textfile(_textfile)
+        except OSError as ex:
+            print(f"WARNING: Could not write metrics to {_textfile}: {ex}")
+
+
+GAMES = Counter('jackbot_games_total', 'Games processed, by game and outcome', ('game', 'status'))
+GAME_SECONDS = Histogram('jackbot_game_duration_seconds', 'Time taken to process a game', ('game',))
+ARTIFACTS = Counter('jackbot_artifacts_total', 'Game artifacts loaded, by source (store, fishery or failed)',
+                    ('source',))
+IMAGES = Counter('jackbot_images_total', 'Images retrieved, by source (cache, download or failed)', ('source',))
+DOWNLOAD_BYTES = Counter('jackbot_download_bytes_total', 'Bytes of images downloaded')
+DOWNLOAD_SECONDS = Histogram('jackbot_download_duration_seconds', 'Time taken to download an image')
+HTTP_RETRIES = Counter('jackbot_http_retries_total', 'Requests to fishery and S3 that were retried')
+HTTP_RETRY_WAIT = Counter('jackbot_http_retry_wait_seconds_total', 'Seconds spent waiting before retrying requests')
+RENDERS = Counter('jackbot_renders_total', 'Drawings rendered, by source (cache or render)', ('source',))
+RENDER_SECONDS = Histogram('jackbot_render_duration_seconds', 'Time taken to render a drawing, in the worker',
+                           ('renderer',))
+SLACK_MESSAGES = Counter('jackbot_slack_messages_total', 'Queued Slack messages sent, by type and outcome',
+                         ('type', 'status'))
+SLACK_CALLS = Counter('jackbot_slack_calls_total', 'Slack Web API calls, by method', ('method',))
+SLACK_RATE_LIMITED = Counter('jackbot_slack_rate_limited_total', 'Slack Web API calls rejected as rate limited',
+                             ('method',))
+SLACK_WAIT = Counter('jackbot_slack_wait_seconds_total', 'Seconds Slack calls waited for their rate limit',
+                     ('method',))
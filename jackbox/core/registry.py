@@ -0,0 +1,68 @@
+"""Registry of the supported games, importing a game's module only when it is used."""
+import importlib
+from collections import namedtuple
+
+Game = namedtuple('Game', ('name', 'module', 'class_name'))
+
+# Game name (as passed to -g) -> module and class
+GAMES = {game.name: game for game in (
+    Game('bracketeering', 'jackbox.bracketeering', 'Bracketeering'),
+    Game('brk', 'jackbox.brk', 'Brk'),
+    Game('civicdoodle', 'jackbox.civicdoodle', 'Civicdoodle'),
+    Game('drawful', 'jackbox.drawful', 'Drawful'),
+    Game('everyday', 'jackbox.everyday', 'Everyday'),
+    Game('overdrawn', 'jackbox.overdrawn', 'Overdrawn'),
+    Game('quiplash2', 'jackbox.quiplash2', 'Quiplash2'),
+    Game('quiplash3', 'jackbox.quiplash3', 'Quiplash3'),
+    Game('range', 'jackbox.range', 'Range'),
+    Game('teeko', 'jackbox.teeko', 'Teeko'),
+    Game('teeko2', 'jackbox.teeko2', 'Teeko'),
+    Game('worldchampions', 'jackbox.worldchampions', 'Worldchampions'),
+)}
+
+# Fishery artifact category, as found in gallery URLs -> game name
+CATEGORIES = {
+    'BRKGame': 'brk',
+    'DrawfulGame': 'drawful',
+    'EverydayGame': 'everyday',
+    'OverdrawnGame': 'overdrawn',
+    'Quiplash2Game': 'quiplash2',
+    'quiplash3Game': 'quiplash3',
+    'RangeGameGame': 'range',
+    'TeeKOGame': 'teeko',
+    'TeeKO2Game': 'teeko2',
+    'WorldChampionsGame': 'worldchampions',
+}
+_CATEGORY_KEYS = {category.lower(): name for category, name in CATEGORIES.items()}
+
+
+def names() -> list:
+    return sorted(GAMES)
+
+
+def find(name: str):
+    """Return the Game for a game name or artifact category, or None if it is not supported.
+
+    Accepts a game name (``teeko2``), a category (``TeeKO2Game``) or a category without its
+    ``Game`` suffix (``TeeKO2``), in any case.
+    """
+    key = name.strip().lower()
+    if key in GAMES:
+        return GAMES[key]
+    for candidate in (key, f"{key}game"):
+        if candidate in _CATEGORY_KEYS:
+            return GAMES[_CATEGORY_KEYS[candidate]]
+    return None
+
+
+def parse_url(url: str):
+    """Return (Game or None, game id) for a gallery or artifact URL."""
+    url_parts = url.strip().strip("/").split("/")
+    if len(url_parts) < 2:
+        return None, url_parts[-1]
+    return find(url_parts[-2]), url_parts[-1]
+
+
+def load(game: Game):
+    """Import the module of a game and return its class."""
+    return getattr(importlib.import_module(game.module), game.class_name)
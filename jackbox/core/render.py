@@ -0,0 +1,290 @@
+"""Rasterize drawings to PNG, either serially or on a pool of worker processes.
+
+Every drawing game normalizes its artifact data into a Drawing, so parsing, rendering and
+caching are implemented once for all of them.
+"""
+import math
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from jackbox.core.cache import digest
+
+
+DOT_RADIUS = 2
+# SVG's default stroke-miterlimit, which cairosvg applies to every shape
+MITER_LIMIT = 4
+
+
+class Drawing:
+    """A drawing normalized for rendering.
+
+    Each stroke is a ``(color, width, coords)`` tuple where coords is a flat ``array('d')``
+    of x, y pairs. A stroke with a single point is drawn as a dot.
+
+    Args:
+        size: (width, height) of the drawing in user units, one unit per output pixel
+        background: Background colour
+        strokes: List of (color, width, coords) tuples
+    """
+    __slots__ = ('size', 'background', 'strokes')
+
+    def __init__(self, size: tuple, background: str, strokes: list):
+        self.size = size
+        self.background = background
+        self.strokes = strokes
+
+    @staticmethod
+    def parse_points(points) -> array:
+        """Return flat coordinates for a list of {'x', 'y'} dicts or an ``"x,y|x,y"`` string."""
+        if isinstance(points, str):
+            return array('d', map(float, points.replace('|', ',').split(',')))
+        return array('d', [value for point in points for value in (point['x'], point['y'])])
+
+    @classmethod
+    def from_lines(cls, lines: list, size: tuple, background: str = "#FFFFFF", line_scale: float = 1):
+        """Build a drawing from the ``lines`` of a game artifact.
+
+        Args:
+            lines: List of dicts with 'color', 'thickness' and 'points' keys
+            size: (width, height) of the drawing
+            background: Background colour
+            line_scale: Multiplier applied to the thickness of lines (but not dots)
+        """
+        strokes = []
+        for line in lines:
+            coords = cls.parse_points(line['points'])
+            if not coords:
+                continue
+            width = line['thickness'] * line_scale if len(coords) > 2 else line['thickness']
+            strokes.append((line['color'], width, coords))
+        return cls(size, background, strokes)
+
+    def cache_key(self, renderer: str) -> str:
+        """Return a digest identifying the rendered output of this drawing with the given backend."""
+        parts = [renderer, *self.size, self.background]
+        for color, width, coords in self.strokes:
+            parts.extend((color, width, coords.tobytes()))
+        return digest(*parts)
+
+
+class Renderer:  # pylint: disable=too-few-public-methods
+    """Base class for drawing rasterizers."""
+    name = None
+
+    def render(self, drawing: Drawing, filename: str):
+        """Rasterize a drawing to a PNG file."""
+        raise NotImplementedError
+
+
+class SvgRenderer(Renderer):  # pylint: disable=too-few-public-methods
+    """Reference backend: builds an SVG document with svgwrite and rasterizes it with cairosvg."""
+    name = 'svg'
+
+    def render(self, drawing, filename):
+        import svgwrite  # pylint: disable=import-outside-toplevel
+        from cairosvg import svg2png  # pylint: disable=import-outside-toplevel
+
+        dwg = svgwrite.Drawing(profile='tiny', viewBox=f"0 0 {drawing.size[0]} {drawing.size[1]}")
+        dwg.add(dwg.rect(insert=(0, 0), size=('100%', '100%'), rx=None, ry=None, fill=drawing.background))
+        for color, width, coords in drawing.strokes:
+            if len(coords) > 2:
+                shape = dwg.polyline(list(zip(coords[0::2], coords[1::2])), stroke=color, fill='none',
+                                     stroke_width=width)
+            else:
+                shape = dwg.circle(center=(coords[0], coords[1]), r=DOT_RADIUS, stroke=color, fill=color,
+                                   stroke_width=width)
+            dwg.add(shape)
+        svg2png(bytestring=dwg.tostring(), write_to=filename)
+
+
+class CairoRenderer(Renderer):
+    """Fast backend: draws strokes straight onto a cairo image surface, skipping the SVG round-trip.
+
+    Drawings using colours it cannot parse are handed to the reference backend.
+    """
+    name = 'cairo'
+
+    @staticmethod
+    def parse_color(color: str) -> tuple:
+        """Return an (r, g, b, a) tuple of floats for a ``#rgb``, ``#rrggbb`` or ``#rrggbbaa`` colour."""
+        match = re.fullmatch(r'#([0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})', color.strip())
+        if not match:
+            raise ValueError(f"Unsupported colour {color!r}")
+        digits = match.group(1)
+        if len(digits) == 3:
+            digits = ''.join(char * 2 for char in digits)
+        channels = [int(digits[i:i + 2], 16) / 255 for i in range(0, len(digits), 2)]
+        return tuple(channels) if len(channels) == 4 else (*channels, 1.0)
+
+    def render(self, drawing, filename):
+        import cairocffi as cairo  # pylint: disable=import-outside-toplevel
+
+        try:
+            colors = {
+                color: self.parse_color(color)
+                for color in {drawing.background, *(stroke[0] for stroke in drawing.strokes)}
+            }
+        except ValueError:
+            SvgRenderer().render(drawing, filename)
+            return
+
+        # Same output size and scaling as cairosvg: one pixel per user unit, rounded
+        width, height = float(drawing.size[0]), float(drawing.size[1])
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, int(round(width)), int(round(height)))
+        context = cairo.Context(surface)
+        if width and height:
+            context.scale(round(width) / width, round(height) / height)
+        context.set_miter_limit(MITER_LIMIT)
+
+        context.set_source_rgba(*colors[drawing.background])
+        context.rectangle(0, 0, width, height)
+        context.fill()
+
+        for color, stroke_width, coords in drawing.strokes:
+            context.set_source_rgba(*colors[color])
+            context.set_line_width(float(stroke_width))
+            if len(coords) > 2:
+                context.move_to(coords[0], coords[1])
+                for position in range(2, len(coords) - 1, 2):
+                    context.line_to(coords[position], coords[position + 1])
+                context.stroke()
+            else:
+                context.new_sub_path()
+                context.arc(coords[0], coords[1], DOT_RADIUS, 0, 2 * math.pi)
+                context.fill_preserve()
+                context.stroke()
+        surface.write_to_png(filename)
+        surface.finish()
+
+
+RENDERERS = {renderer.name: renderer for renderer in (CairoRenderer, SvgRenderer)}
+DEFAULT_RENDERER = SvgRenderer.name
+
+
+def get_renderer(name: str = DEFAULT_RENDERER) -> Renderer:
+    """Return a renderer instance by name ('cairo' or 'svg')."""
+    try:
+        return RENDERERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown renderer {name!r}, expected one of {', '.join(RENDERERS)}") from None
+
+
+def render(drawing: Drawing, filename: str, renderer: str = DEFAULT_RENDERER) -> str:
+    """Render a drawing to filename with the named backend and return the filename.
+
+    This is the function dispatched to render workers, so it must stay at module level. The PNG is
+    written to a temporary file and moved onto filename, so a file hard-linked into the render cache
+    is replaced rather than overwritten.
+    """
+    print(f"INFO: Processing image {filename}")
+    directory = os.path.dirname(os.path.abspath(filename))
+    handle, tmp_path = tempfile.mkstemp(dir=directory, prefix='.render-', suffix='.png')
+    os.close(handle)
+    try:
+        get_renderer(renderer).render(drawing, tmp_path)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return filename
+
+
+def timed_render(drawing: Drawing, filename: str, renderer: str = DEFAULT_RENDERER) -> tuple:
+    """Render like render() and return (filename, start time, seconds taken, process id).
+
+    Timing happens in the process doing the render, so the time spent waiting for a worker is excluded.
+    """
+    start = time.time()
+    started = time.perf_counter()
+    render(drawing, filename, renderer)
+    return filename, start, time.perf_counter() - started, os.getpid()
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+class RenderPool:
+    """Run render jobs in worker processes, or serially in this process when that is not possible.
+
+    Args:
+        workers: Number of worker processes. 0 or 1 renders serially in the calling process.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and self.workers > 1:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                except (OSError, NotImplementedError, ImportError) as ex:
+                    print(f"WARNING: Could not start render workers, rendering serially: {ex}")
+                    self.workers = 0
+            return self._executor
+
+    def map(self, func, jobs: list) -> list:
+        """Call func(*job) for every job and return the results in job order.
+
+        Args:
+            func: Module-level (picklable) function doing the rendering
+            jobs: List of argument tuples
+        """
+        executor = self._get_executor() if len(jobs) > 1 else None
+        if executor is None:
+            return [func(*job) for job in jobs]
+
+        futures = [executor.submit(func, *job) for job in jobs]
+        results = []
+        for position, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool as ex:
+                print(f"WARNING: Render workers died, rendering the remaining images serially: {ex}")
+                self.close()
+                self.workers = 0
+                results.extend(func(*job) for job in jobs[position:])
+                break
+        return results
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_render_pool(workers: int) -> RenderPool:
+    """Return the process-wide pool with the given worker count, creating it on first use.
+
+    Worker processes are started lazily and kept warm for later games in the same process.
+    """
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = RenderPool(workers)
+        return _pools[workers]
+
+
+def close_render_pools():
+    """Shut down the worker processes of every render pool in this process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
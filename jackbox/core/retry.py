@@ -0,0 +1,122 @@
+"""Iterative retry policy with exponential backoff, jitter and a total deadline."""
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from jackbox.core import metrics
+
+# Statuses worth retrying for requests that are expected to succeed on the first try
+TRANSIENT_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+
+class RetryPolicy:  # pylint: disable=too-many-instance-attributes
+    """Retry HTTP requests with exponentially growing, jittered delays.
+
+    Args:
+        max_attempts: Maximum number of attempts, including the first one
+        base_delay: Delay in seconds before the second attempt
+        max_delay: Upper bound for a single computed delay in seconds
+        multiplier: Growth factor applied to the delay after every attempt
+        jitter: Fraction of each delay that is randomized (0 disables jitter, 1 is full jitter)
+        deadline: Seconds after which no further attempt is started, measured from the first attempt
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 30.0,
+            multiplier: float = 2.0, jitter: float = 1.0, deadline: float = 120.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.deadline = deadline
+        # Replaceable so tests can run the policy against a fake clock
+        self.clock = time.monotonic
+        self.sleep = time.sleep
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Build a policy from the ``retry_*`` keys of an account config."""
+        return cls(
+            max_attempts=int(config.get('retry_max_attempts', 5)),
+            base_delay=float(config.get('retry_base_delay', 1.0)),
+            max_delay=float(config.get('retry_max_delay', 30.0)),
+            jitter=float(config.get('retry_jitter', 1.0)),
+            deadline=float(config.get('retry_deadline', 120.0)),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay to wait after the given (1-based) failed attempt."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    @staticmethod
+    def retry_after(response) -> float | None:
+        """Return the delay requested by a Retry-After header, in seconds, if any."""
+        if response is None:
+            return None
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def run(self, request, description: str, retry_statuses: tuple | None = TRANSIENT_STATUSES):
+        """Call request() until it returns a successful response or the policy gives up.
+
+        Args:
+            request: Callable taking no arguments and returning a ``requests.Response``
+            description: Short label used in log lines
+            retry_statuses: Status codes that are retried; None retries every non-200 status
+
+        Returns:
+            The last response received. Connection errors from the last attempt are re-raised.
+        """
+        started = self.clock()
+        for attempt in range(1, self.max_attempts + 1):
+            attempt_started = self.clock()
+            response = None
+            try:
+                response = request()
+            except requests.RequestException as ex:
+                error = ex
+                outcome = f"{ex.__class__.__name__}: {ex}"
+            else:
+                error = None
+                outcome = f"HTTP {response.status_code}"
+            latency = self.clock() - attempt_started
+
+            if response is not None and (
+                    response.status_code == 200
+                    or (retry_statuses is not None and response.status_code not in retry_statuses)):
+                print(f"INFO: {description}: {outcome} in {latency:.2f}s (attempt {attempt}/{self.max_attempts})")
+                return response
+
+            print(f"WARNING: {description}: {outcome} in {latency:.2f}s (attempt {attempt}/{self.max_attempts})")
+            if attempt == self.max_attempts:
+                break
+            delay = self.retry_after(response)
+            if delay is None:
+                delay = self.backoff(attempt)
+            if self.clock() - started + delay > self.deadline:
+                print(f"WARNING: {description}: giving up, next attempt would exceed the {self.deadline:.0f}s deadline")
+                break
+            print(f"INFO: {description}: retrying in {delay:.2f}s")
+            metrics.HTTP_RETRIES.inc()
+            metrics.HTTP_RETRY_WAIT.inc(delay)
+            if response is not None:
+                # Release the connection of a streamed response before waiting
+                response.close()
+            self.sleep(delay)
+
+        if response is None:
+            raise error
+        return response
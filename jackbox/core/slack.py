@@ -0,0 +1,219 @@
+"""Slack Web API access: rate-limit aware dispatch and concurrent file uploads."""
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from slack_sdk.errors import SlackApiError
+
+from jackbox.core import metrics, trace
+
+# Rate limit tier of every Slack Web API method jackbot calls
+# https://docs.slack.dev/apis/web-api/rate-limits
+METHOD_TIERS = {
+    'auth.test': 'special',
+    'chat.postMessage': 'special',
+    'chat.delete': 'tier3',
+    'conversations.history': 'tier3',
+    'conversations.list': 'tier2',
+    'conversations.replies': 'tier3',
+    'files.completeUploadExternal': 'tier4',
+    'files.delete': 'tier3',
+    'files.getUploadURLExternal': 'tier4',
+}
+
+# Maximum number of files shared by a single files.completeUploadExternal call
+MAX_FILES_PER_MESSAGE = 10
+
+# Number of requests allowed in flight at once per tier
+DEFAULT_CONCURRENCY = {
+    'tier1': 1,
+    'tier2': 2,
+    'tier3': 4,
+    'tier4': 8,
+    'special': 1,
+}
+
+
+# Requests per minute allowed per tier. 'special' covers chat.postMessage (about one message
+# per second per channel) and auth.test.
+DEFAULT_RATE_LIMITS = {
+    'tier1': 1,
+    'tier2': 20,
+    'tier3': 50,
+    'tier4': 100,
+    'special': 60,
+}
+
+
+def concurrency_for(config: dict, method: str) -> int:
+    """Return the configured concurrency for a Slack method, based on its rate limit tier."""
+    limits = {**DEFAULT_CONCURRENCY, **config.get('slack_concurrency', {})}
+    return max(1, int(limits[METHOD_TIERS.get(method, 'tier1')]))
+
+
+class FileUploader:
+    """Run the first two steps of the external upload flow for many files concurrently.
+
+    files.getUploadURLExternal and the upload of the bytes do not depend on the channel or
+    thread, so they can all run ahead of time. Each file is then shared in the right place,
+    in order, by calling complete() with its file id.
+
+    Args:
+        client: slack_sdk WebClient
+        http: HttpClient used to send the file bytes to the upload URL
+        concurrency: Maximum number of uploads in flight
+    """
+
+    def __init__(self, client, http, concurrency: int):
+        self.client = client
+        self.http = http
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def start(self, path: str):
+        """Begin uploading a file. Returns a Future resolving to its Slack file id."""
+        return self._executor.submit(self._upload, path)
+
+    def _upload(self, path: str) -> str:
+        with trace.span('slack.upload', file=os.path.basename(path), bytes=os.path.getsize(path)):
+            response = self.client.files_getUploadURLExternal(
+                filename=os.path.basename(path),
+                length=os.path.getsize(path),
+            )
+            with open(path, 'rb') as file_handle:
+                upload = self.http.post(response['upload_url'], data=file_handle)
+            if upload.status_code != 200:
+                raise RuntimeError(f"Failed to upload {path}: ({upload.status_code}) {upload.text}")
+            return response['file_id']
+
+    def complete(self, files: list, channel: str, thread_ts: str = None, initial_comment: str = None):
+        """Share uploaded files, given as a list of {'id', 'title'} dicts, in a channel or thread."""
+        kwargs = {'files': files, 'channel_id': channel}
+        if thread_ts:
+            kwargs['thread_ts'] = thread_ts
+        if initial_comment:
+            kwargs['initial_comment'] = initial_comment
+        return self.client.files_completeUploadExternal(**kwargs)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class TokenBucket:
+    """Thread-safe token bucket pacing calls to a single rate limit.
+
+    Args:
+        per_minute: Sustained number of calls allowed per minute
+        burst: Number of calls that may be made back to back after an idle period
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(self, per_minute: float, burst: float = None, clock=time.monotonic):
+        self.rate = per_minute / 60
+        self.capacity = burst if burst is not None else max(1.0, per_minute / 10)
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.sleep = time.sleep
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available. Returns the number of seconds waited."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative: later callers queue up behind the ones already waiting
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+        if wait:
+            self.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Hold back every caller for the given number of seconds, e.g. after a Retry-After."""
+        with self._lock:
+            now = self.clock()
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            # Move the refill past the pause; at most one token is ready when it ends, so callers
+            # resume paced instead of in a burst
+            resume = max(self._updated, now + seconds)
+            self._tokens = min(1.0, self._tokens + (resume - self._updated) * self.rate)
+            self._updated = resume
+
+
+class SlackDispatcher:  # pylint: disable=too-many-instance-attributes
+    """Proxy for a slack_sdk WebClient that paces every API call and retries rate-limited ones.
+
+    Each API method gets its own token bucket sized by its rate limit tier (chat.postMessage
+    is paced per channel), so requests are spread out before Slack starts rejecting them.
+    A ``ratelimited`` error pauses the method's bucket for the Retry-After period and the
+    call is repeated.
+
+    Args:
+        client: slack_sdk WebClient
+        config: Account config; ``slack_rate_limits`` overrides the per-tier calls per minute
+        max_retries: Number of times a rate-limited call is repeated before giving up
+    """
+
+    def __init__(self, client, config: dict = None, max_retries: int = 5):
+        self.client = client
+        self.max_retries = max_retries
+        self._rates = {**DEFAULT_RATE_LIMITS, **(config or {}).get('slack_rate_limits', {})}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.calls = Counter()
+        self.rate_limited = Counter()
+        self.wait_seconds = 0.0
+        # Replaceable so tests can pace calls against a fake clock
+        self.clock = time.monotonic
+        self.sleep = time.sleep
+
+    def _bucket(self, method: str, channel: str = None) -> TokenBucket:
+        key = (method, channel if method == 'chat.postMessage' else None)
+        with self._lock:
+            if key not in self._buckets:
+                bucket = TokenBucket(float(self._rates[METHOD_TIERS[method]]), clock=self.clock)
+                bucket.sleep = self.sleep
+                self._buckets[key] = bucket
+            return self._buckets[key]
+
+    def __getattr__(self, name):
+        func = getattr(self.client, name)
+        # chat_postMessage -> chat.postMessage, files_getUploadURLExternal -> files.getUploadURLExternal
+        method = name.replace('_', '.', 1)
+        if method not in METHOD_TIERS:
+            return func
+
+        def call(*args, **kwargs):
+            return self.call(method, func, *args, **kwargs)
+        return call
+
+    def call(self, method: str, func, *args, **kwargs):
+        """Call func, the WebClient implementation of method, within the method's rate limit."""
+        bucket = self._bucket(method, kwargs.get('channel'))
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            with self._lock:
+                self.calls[method] += 1
+                self.wait_seconds += waited
+            metrics.SLACK_CALLS.inc(method=method)
+            if waited:
+                metrics.SLACK_WAIT.inc(waited, method=method)
+            try:
+                return func(*args, **kwargs)
+            except SlackApiError as ex:
+                if ex.response.get('error') != 'ratelimited' or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                retry_after = float(ex.response.headers.get('Retry-After', 1))
+                with self._lock:
+                    self.rate_limited[method] += 1
+                metrics.SLACK_RATE_LIMITED.inc(method=method)
+                print(f"WARNING: Slack rate limited {method}, waiting {retry_after:g}s "
+                      f"({attempt}/{self.max_retries})")
+                bucket.pause(retry_after)
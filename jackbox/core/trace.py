@@ -0,0 +1,127 @@
+"""Lightweight tracing: timed spans written as JSON lines and, optionally, a Chrome trace.
+
+Tracing is off until configure() is called; span() then costs next to nothing. Every span
+records its name, start time, duration, process and thread, plus any attributes passed in.
+The Chrome trace can be opened in chrome://tracing or https://ui.perfetto.dev.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_tracer = None  # pylint: disable=invalid-name
+
+
+class Tracer:
+    """Write finished spans to a JSON lines file and/or a Chrome trace event file.
+
+    Both files are written as spans finish, so a long-running process can be traced and an
+    interrupted run still leaves a usable trace.
+
+    Args:
+        path: JSON lines file, one span per line
+        chrome_path: Chrome trace event file (JSON array format)
+    """
+
+    def __init__(self, path: str = None, chrome_path: str = None):
+        self._lock = threading.Lock()
+        # Both files stay open until close()
+        # pylint: disable=consider-using-with
+        self._file = open(path, 'a', buffering=1, encoding='utf-8') if path else None
+        self._chrome = open(chrome_path, 'w', encoding='utf-8') if chrome_path else None
+        # pylint: enable=consider-using-with
+        self._chrome_events = 0
+        if self._chrome:
+            self._chrome.write('[\n')
+
+    def record(self, name: str, start: float, duration: float, pid: int = None, thread: str = None, **attributes):
+        """Write a finished span.
+
+        Args:
+            name: Span name, e.g. ``image.download``
+            start: Start time in seconds since the epoch
+            duration: Duration in seconds
+            pid: Process the span ran in; defaults to this process
+            thread: Thread the span ran in; defaults to the current thread
+            attributes: Extra JSON serializable fields
+        """
+        pid = pid or os.getpid()
+        thread = thread or threading.current_thread().name
+        line = {
+            'name': name,
+            'start': round(start, 6),
+            'duration_ms': round(duration * 1000, 3),
+            'pid': pid,
+            'thread': thread,
+            **attributes,
+        }
+        with self._lock:
+            if self._file:
+                self._file.write(json.dumps(line) + '\n')
+            if self._chrome:
+                event = {
+                    'name': name,
+                    'ph': 'X',
+                    'ts': round(start * 1e6),
+                    'dur': round(duration * 1e6),
+                    'pid': pid,
+                    'tid': thread,
+                    'args': attributes,
+                }
+                self._chrome.write((',\n' if self._chrome_events else '') + json.dumps(event))
+                self._chrome_events += 1
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            if self._chrome:
+                self._chrome.write('\n]\n')
+                self._chrome.close()
+                self._chrome = None
+
+
+def configure(path: str = None, chrome_path: str = None):
+    """Start tracing to the given files, replacing any earlier configuration. The files are finished at exit."""
+    global _tracer  # pylint: disable=global-statement
+    close()
+    if path or chrome_path:
+        _tracer = Tracer(path, chrome_path)
+        atexit.register(close)
+
+
+def close():
+    """Stop tracing and finish the trace files."""
+    global _tracer  # pylint: disable=global-statement
+    if _tracer:
+        _tracer.close()
+        _tracer = None
+
+
+def record(name: str, start: float, duration: float, **attributes):
+    """Record a span timed elsewhere, e.g. in a render worker process. See Tracer.record."""
+    tracer = _tracer
+    if tracer:
+        tracer.record(name, start, duration, **attributes)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time the enclosed block as a span. Yields a dict; fields added to it are recorded with the span."""
+    tracer = _tracer
+    if tracer is None:
+        yield {}
+        return
+    fields = dict(attributes)
+    start = time.time()
+    started = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as ex:
+        fields['error'] = type(ex).__name__
+        raise
+    finally:
+        tracer.record(name, start, time.perf_counter() - started, **fields)
@@ -0,0 +1,156 @@
+"""Sources of game URLs for the long-running watch mode: a watched directory and a local HTTP endpoint."""
+import json
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class SubmissionQueue:
+    """Thread-safe FIFO of submitted game URLs that ignores URLs already queued or in progress."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def submit(self, url: str) -> bool:
+        """Queue a URL. Returns False if it is already queued or being processed."""
+        url = url.strip()
+        with self._lock:
+            if not url or url in self._active:
+                return False
+            self._active.add(url)
+        self._queue.put(url)
+        print(f"INFO: Queued {url}")
+        return True
+
+    def get(self, timeout: float = None):
+        """Return the next URL, or None if none arrived within timeout seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def done(self, url: str):
+        """Mark a URL as processed, so it can be submitted again."""
+        with self._lock:
+            self._active.discard(url)
+
+    def __len__(self):
+        return self._queue.qsize()
+
+
+def parse_urls(text: str) -> list:
+    """Return the URLs in a submission: one per line, ignoring blank lines and # comments."""
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.strip().startswith('#')]
+
+
+class DirectoryWatcher(threading.Thread):
+    """Poll a directory for files of game URLs and submit them.
+
+    Every regular file that has not been modified for settle seconds is read, its URLs are
+    submitted and it is moved to the ``processed`` subdirectory.
+
+    Args:
+        directory: Directory to watch
+        submit: Callable taking a URL
+        interval: Seconds between two scans
+        settle: Seconds a file must be left unchanged before it is read, so half-written files are skipped
+    """
+
+    def __init__(self, directory: str, submit, interval: float = 2.0, settle: float = 1.0):
+        super().__init__(name='directory-watcher', daemon=True)
+        self.directory = directory
+        self.processed = os.path.join(directory, 'processed')
+        self.submit = submit
+        self.interval = interval
+        self.settle = settle
+        self._stopping = threading.Event()
+        os.makedirs(self.processed, exist_ok=True)
+
+    def scan(self):
+        """Submit the URLs of every settled file in the directory."""
+        now = time.time()
+        for entry in sorted(os.scandir(self.directory), key=lambda entry: entry.name):
+            if not entry.is_file() or entry.name.startswith('.'):
+                continue
+            try:
+                if now - entry.stat().st_mtime < self.settle:
+                    continue
+                with open(entry.path, encoding='utf-8') as file:
+                    urls = parse_urls(file.read())
+                os.replace(entry.path, os.path.join(self.processed, entry.name))
+            except (OSError, UnicodeDecodeError) as ex:
+                print(f"WARNING: Could not read {entry.path}: {ex}")
+                continue
+            for url in urls:
+                self.submit(url)
+
+    def run(self):
+        print(f"INFO: Watching {self.directory} for game URLs")
+        while not self._stopping.is_set():
+            self.scan()
+            self._stopping.wait(self.interval)
+
+    def stop(self):
+        self._stopping.set()
+
+
+class SubmissionServer(ThreadingHTTPServer):
+    """Local HTTP endpoint accepting game URLs.
+
+    ``POST /`` with one URL per line in the body, or ``POST /?url=...``, queues games.
+    ``GET /status`` returns the JSON produced by the status callable.
+
+    Args:
+        port: Port to listen on, on 127.0.0.1 only
+        submit: Callable taking a URL and returning whether it was queued
+        status: Callable returning a JSON-serializable status dict
+    """
+    daemon_threads = True
+
+    def __init__(self, port: int, submit, status):
+        self.submit = submit
+        self.status = status
+        super().__init__(('127.0.0.1', port), _SubmissionHandler)
+
+    def start(self):
+        """Serve requests in a background thread."""
+        print(f"INFO: Accepting game URLs on http://127.0.0.1:{self.server_address[1]}/")
+        threading.Thread(target=self.serve_forever, name='submission-server', daemon=True).start()
+
+
+class _SubmissionHandler(BaseHTTPRequestHandler):
+
+    def _reply(self, code: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if urlparse(self.path).path != '/status':
+            self._reply(404, {'error': 'not found'})
+            return
+        self._reply(200, self.server.status())
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        request = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8', errors='replace') if length else ''
+        urls = parse_qs(request.query).get('url', []) + parse_urls(body)
+        if not urls:
+            self._reply(400, {'error': 'no game URLs given'})
+            return
+        queued, ignored = [], []
+        for url in urls:
+            (queued if self.server.submit(url) else ignored).append(url)
+        self._reply(202, {'queued': queued, 'ignored': ignored})
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        print(f"INFO: {self.address_string()} {format % args}")
@@ -1,40 +1,50 @@
 import os
-import svgwrite
-from cairosvg import svg2png
 from jackbox import Jackbox
+from jackbox.core.render import Drawing
 
 
 class Drawful(Jackbox):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
 
         self.data_url = self.gallery_url = 'DrawfulGame'
 
-    def create_image(self, _drawing, _name):
-        print(f"INFO: Processing image {_name}")
-        dwg = svgwrite.Drawing(profile='tiny', viewBox='0 0 240 320')
-        dwg.add(dwg.rect(insert=(0, 0), size=('100%', '100%'), rx=None, ry=None, fill="#FFFFFF"))
-        for line in _drawing['lines']:
-            if len(line['points']) > 1:
-                shape = dwg.polyline(
-                    [(point['x'], point['y']) for point in line['points']],
-                    stroke=line['color'],
-                    fill='none',
-                    stroke_width=line['thickness']
-                )
-            else:
-                shape = dwg.circle(
-                    center=(line['points'][0]['x'], line['points'][0]['y']),
-                    r=2,
-                    stroke=line['color'],
-                    fill=line['color'],
-                    stroke_width=line['thickness']
-                )
-            dwg.add(shape)
-        filename = f"./{self.clean_string(_name)}.png"
-        svg2png(bytestring=dwg.tostring(), write_to=filename)
-        return filename
+    @staticmethod
+    def normalize_drawing(_drawing):
+        return Drawing.from_lines(_drawing['lines'], size=(240, 320))
+
+    def drawing_blocks(self, drawing):
+        """Return the Slack blocks revealing a drawing's actual title, its artist and the lies told about it."""
+        title = drawing['title']['text']
+        blocks = [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": self.clean_string(
+                        f"*Actual Title*: `{title}`\n*Artist*: _{drawing['player']['name']}\n",
+                        underscore=False
+                    )
+                }
+            }
+        ]
+        if "lies" in drawing and len(drawing['lies']) > 0:
+            lies = []
+            for lie in drawing['lies']:
+                lies.append(self.clean_string(f"*{lie['player']['name']}*:\t`{lie['text']}`", underscore=False))
+            blocks.append(
+                {
+                    "type": "context",
+                    "elements": [
+                        {
+                            "type": "mrkdwn",
+                            "text": "\n".join(lies)
+                        }
+                    ]
+                }
+            )
+        return blocks
 
     def process_game(self):
         data = super().process_game()
@@ -43,60 +53,35 @@ class Drawful(Jackbox):
                 # Queue intro message first
                 self.queue_intro_message()
 
+                # Render player portraits and drawings together so they share the render pool
+                portraits = data['blob']['playerPortraits']
+                drawings = data['blob']['drawings']
+                names = [player['player']['name'] for player in portraits]
+                names += [f"{drawing['player']['name']}-{drawing['title']['text']}" for drawing in drawings]
+                filenames = self.render_drawings([
+                    (self.normalize_drawing(drawing), f"./{self.clean_string(name)}.png")
+                    for drawing, name in zip(portraits + drawings, names)
+                ])
+
                 # Process player portraits
-                for player in data['blob']['playerPortraits']:
+                for player, filename in zip(portraits, filenames):
                     player_name = player['player']['name']
-                    filename = self.create_image(player, player_name)
                     self.queue_file_upload(
                         file=filename,
                         title=player_name
                     )
 
                 # Process drawings
-                for drawing in data['blob']['drawings']:
-                    filename = self.create_image(
-                        drawing,
-                        f"{drawing['player']['name']}-{drawing['title']['text']}"
-                    )
-
+                for drawing, filename in zip(drawings, filenames[len(portraits):]):
                     text = "Stare at the art..."
                     self.queue_file_upload(
                         file=filename,
                         title=text
                     )
 
-                    title = drawing['title']['text']
-                    blocks = [
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": self.clean_string(
-                                    f"*Actual Title*: `{title}`\n*Artist*: _{drawing['player']['name']}\n",
-                                    underscore=False
-                                )
-                            }
-                        }
-                    ]
-                    if "lies" in drawing and len(drawing['lies']) > 0:
-                        lies = []
-                        for lie in drawing['lies']:
-                            lies.append(self.clean_string(f"*{lie['player']['name']}*:\t`{lie['text']}`", underscore=False))
-                        blocks.append(
-                            {
-                                "type": "context",
-                                "elements": [
-                                    {
-                                        "type": "mrkdwn",
-                                        "text": "\n".join(lies)
-                                    }
-                                ]
-                            }
-                        )
-
                     self.queue_chat_message(
                         text=text,
-                        blocks=str(blocks)
+                        blocks=str(self.drawing_blocks(drawing))
                     )
 
                 # All messages prepared successfully, send them
@@ -8,8 +8,8 @@ https://s3.amazonaws.com/jbg-blobcast-artifacts/EverydayGame/9423fa464204f263061
 """
 class Everyday(Jackbox):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
 
         self.data_url = self.gallery_url = self.base_image_url = self.base_gen_image_url = 'EverydayGame'
         self.game_name = "The Devils in the Details"
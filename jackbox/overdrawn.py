@@ -4,8 +4,8 @@ from jackbox import Jackbox
 
 class Overdrawn(Jackbox):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
 
         self.data_url = self.gallery_url = self.base_image_url = self.base_gen_image_url = 'OverdrawnGame'
 
@@ -18,15 +18,22 @@ class Overdrawn(Jackbox):
                 # Queue intro message first
                 self.queue_intro_message()
 
-                for index, round_data in enumerate(data['rounds']):
+                titles = []
+                for round_data in data['rounds']:
                     if 'titleVotes' in round_data and 'winningTitle' in round_data['titleVotes']:
-                        title = round_data['titleVotes']['winningTitle']
+                        titles.append(round_data['titleVotes']['winningTitle'])
                     elif 'artQuestion' in round_data and 'displayText' in round_data['artQuestion']:
-                        title = round_data['artQuestion']['displayText']
+                        titles.append(round_data['artQuestion']['displayText'])
                     else:
-                        title = "UNDEFINED"
-                    filename = f"{self.clean_string(title)}.{self.ext}"
-                    if self.generate_images(index, filename):
+                        titles.append("UNDEFINED")
+                filenames = [f"{self.clean_string(title)}.{self.ext}" for title in titles]
+                results = self.generate_images_concurrently(
+                    [{'index': index, 'filename': filename} for index, filename in enumerate(filenames)]
+                )
+
+                for index, title in enumerate(titles):
+                    filename = filenames[index]
+                    if results[index]:
                         initial_comment = f"*{title}*"
                         self.queue_file_upload(
                             file=filename,
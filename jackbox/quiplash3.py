@@ -4,8 +4,8 @@ from jackbox import Jackbox
 
 class Quiplash3(Jackbox):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
 
         self.data_url = self.gallery_url = self.base_image_url = self.base_gen_image_url = 'quiplash3Game'
 
@@ -16,9 +16,15 @@ class Quiplash3(Jackbox):
                 # Queue intro message first
                 self.queue_intro_message()
 
-                for index, matchup in enumerate(data['blob']['matchups']):
-                    filename = f"{self.clean_string(matchup['question']['prompt'])}.{self.ext}"
-                    if self.generate_images(index, filename):
+                matchups = data['blob']['matchups']
+                filenames = [f"{self.clean_string(matchup['question']['prompt'])}.{self.ext}" for matchup in matchups]
+                results = self.generate_images_concurrently(
+                    [{'index': index, 'filename': filename} for index, filename in enumerate(filenames)]
+                )
+
+                for index, matchup in enumerate(matchups):
+                    filename = filenames[index]
+                    if results[index]:
                         title = matchup['question']['prompt']
                         quips = [f"*{title}*"]
                         quiplash = False
@@ -3,14 +3,35 @@ from jackbox import Jackbox
 
 class Range(Jackbox):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
 
         self.data_url = self.gallery_url = self.base_image_url = self.base_gen_image_url = "RangeGameGame"
         self.ext = 'png'
         self.game_name = 'Nonsensory'
 
 
+    def image_jobs(self, blob):
+        """Return the image of every response, with its player and the prompt text it was guessing."""
+        players = {player.get("sessionId"): player for player in blob.get("players")}
+
+        jobs = []
+        for round_data in blob.get("roundData"):
+            prompts = {prompt.get('id'): prompt for prompt in round_data.get("prompts")}
+            for index, response in enumerate(round_data.get("responses")):
+                prompt = prompts.get(response.get('promptId'))
+                round_name = f"round_{round_data.get('index')}_{index}"
+                jobs.append({
+                    'round_name': round_name,
+                    'player': players.get(response.get("authorSessionId")).get("name"),
+                    'text': prompt.get("rangeType").get("values")[response.get("targetValueIndex")].get("guessingText"),
+                    'image_urls': {
+                        self.ext: f"{self.base_image_url}/round_{round_data.get('index')}_{index}.{self.ext}"
+                    },
+                    'filename': f"{round_name}.{self.ext}",
+                })
+        return jobs
+
     def process_game(self):
         data = super().process_game()
         if data:
@@ -18,27 +39,21 @@ class Range(Jackbox):
                 # Queue intro message first
                 self.queue_intro_message()
 
-                players = {player.get("sessionId"): player for player in data.get("blob").get("players")}
-
-                for round_data in data.get("blob").get("roundData"):
-                    prompts = {prompt.get('id'): prompt for prompt in round_data.get("prompts")}
-                    for index, response in enumerate(round_data.get("responses")):
-                        player = players.get(response.get("authorSessionId")).get("name")
-                        prompt = prompts.get(response.get('promptId'))
-                        round_name = f"round_{round_data.get('index')}_{index}"
-                        text = prompt.get("rangeType").get("values")[response.get("targetValueIndex")].get("guessingText")
-                        image_urls = {
-                            self.ext: f"{self.base_image_url}/round_{round_data.get('index')}_{index}.{self.ext}"
-                        }
-                        filename = f"{round_name}.{self.ext}"
-                        if self.generate_images(round_name, filename, image_urls=image_urls):
-                            self.queue_file_upload(
-                                file=filename,
-                                title=f"Brought to to you by: {player}",
-                                initial_comment=f"Prompt text: {text}"
-                            )
-                        else:
-                            raise Exception(f"Failed to generate image for {round_name}")
+                jobs = self.image_jobs(data.get("blob"))
+                results = self.generate_images_concurrently([
+                    {'index': job['round_name'], 'filename': job['filename'], 'image_urls': job['image_urls']}
+                    for job in jobs
+                ])
+
+                for job, result in zip(jobs, results):
+                    if result:
+                        self.queue_file_upload(
+                            file=job['filename'],
+                            title=f"Brought to to you by: {job['player']}",
+                            initial_comment=f"Prompt text: {job['text']}"
+                        )
+                    else:
+                        raise Exception(f"Failed to generate image for {job['round_name']}")
 
                 # All messages prepared successfully, send them
                 self.send_queued_messages()
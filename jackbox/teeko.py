@@ -1,40 +1,18 @@
 import os
-import svgwrite
-from cairosvg import svg2png
 from jackbox import Jackbox
+from jackbox.core.render import Drawing
 
 
 class Teeko(Jackbox):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
 
         self.data_url = self.gallery_url = 'TeeKOGame'
 
-    def create_image(self, _drawing, _name):
-        print(f"INFO: Processing image {_name}")
-        dwg = svgwrite.Drawing(profile='tiny', viewBox='0 0 300 300')
-        dwg.add(dwg.rect(insert=(0, 0), size=('100%', '100%'), rx=None, ry=None, fill=_drawing['background']))
-        for line in _drawing['lines']:
-            if len(line['points']) > 1:
-                shape = dwg.polyline(
-                    [(point['x'], point['y']) for point in line['points']],
-                    stroke=line['color'],
-                    fill='none',
-                    stroke_width=line['thickness']
-                )
-            else:
-                shape = dwg.circle(
-                    center=(line['points'][0]['x'], line['points'][0]['y']),
-                    r=2,
-                    stroke=line['color'],
-                    fill=line['color'],
-                    stroke_width=line['thickness']
-                )
-            dwg.add(shape)
-        filename = f"./{self.clean_string(_name)}.png"
-        svg2png(bytestring=dwg.tostring(), write_to=filename)
-        return filename
+    @staticmethod
+    def normalize_drawing(_drawing):
+        return Drawing.from_lines(_drawing['lines'], size=(300, 300), background=_drawing['background'])
 
     def process_game(self):
         data = super().process_game()
@@ -43,14 +21,19 @@ class Teeko(Jackbox):
                 # Queue intro message first
                 self.queue_intro_message()
 
-                for shirt in data['shirts']:
+                shirts = data['shirts']
+                filenames = self.render_drawings([
+                    (self.normalize_drawing(shirt['drawing']), f"./{self.clean_string(shirt['slogan']['slogan'])}.png")
+                    for shirt in shirts
+                ])
+
+                for shirt, filename in zip(shirts, filenames):
                     title = shirt['slogan']['slogan']
                     drawing = shirt['drawing']
                     if drawing['artist'] is not None:
                         artist = drawing['artist']['name']
                     else:
                         artist = "None"
-                    filename = self.create_image(drawing, title)
 
                     comments = [
                         f"*Artist*: _{artist}_",
@@ -1,54 +1,29 @@
 import os
-import svgwrite
-from cairosvg import svg2png
 from jackbox import Jackbox
+from jackbox.core.render import Drawing
 
 
 class Worldchampions(Jackbox):
 
-    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False):
-        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run)
+    def __init__(self, game_id: str = None, api_account: str = 'dev', dry_run: bool = False, **kwargs):
+        super().__init__(game_id=game_id, api_account=api_account, dry_run=dry_run, **kwargs)
 
         self.data_url = self.gallery_url = self.base_image_url = self.base_gen_image_url = 'WorldChampionsGame'
         self.game_name = "Champ'd UP"
 
     @staticmethod
-    def _split_point(point):
-        _point = point.split(",")
-        return _point[0], _point[1]
+    def normalize_drawing(_drawing):
+        # Lines are drawn five times thicker than their recorded thickness, dots are not
+        return Drawing.from_lines(
+            _drawing['lines'], size=(_drawing['size']['width'], _drawing['size']['height']), line_scale=5
+        )
 
-    def create_image(self, _drawing):
+    def image_filename(self, _drawing):
         image_name = f"{_drawing['player']['name']}-{_drawing['name']}"
-        print(f"INFO: Processing image {image_name}")
-        dwg = svgwrite.Drawing(profile='tiny', viewBox=f"0 0 {_drawing['size']['width']} {_drawing['size']['height']}")
-        dwg.add(dwg.rect(insert=(0, 0), size=('100%', '100%'), rx=None, ry=None, fill="#FFFFFF"))
-        for line in _drawing['lines']:
-            points = line['points'].split("|")
-            if len(points) > 1:
-                shape = dwg.polyline(
-                    [self._split_point(point) for point in points],
-                    stroke=line['color'],
-                    fill='none',
-                    stroke_width=line['thickness'] * 5
-                )
-            else:
-                point = self._split_point(points[0])
-                shape = dwg.circle(
-                    center=(point[0], point[1]),
-                    r=2,
-                    stroke=line['color'],
-                    fill=line['color'],
-                    stroke_width=line['thickness']
-                )
-            dwg.add(shape)
-        filename = f"./{self.clean_string(image_name)}.png"
-        svg2png(bytestring=dwg.tostring(), write_to=filename)
-        return filename
-
-    def _queue_drawing_message(self, drawing, metadata):
-        """Queue messages for a drawing (file upload + chat message)."""
-        filename = self.create_image(drawing)
+        return f"./{self.clean_string(image_name)}.png"
 
+    def _queue_drawing_message(self, drawing, metadata, filename):
+        """Queue messages for a rendered drawing (file upload + chat message)."""
         name = drawing['name']
         title = metadata['title']
         text = f"Stare at the art... {name}"
@@ -91,10 +66,17 @@ class Worldchampions(Jackbox):
                 # Queue intro message first
                 self.queue_intro_message()
 
-                for index, matchup in enumerate(data['blob']['matchups']):
+                drawings = []
+                for matchup in data['blob']['matchups']:
                     metadata = {"full_title": matchup['fullTitle'], "title": matchup['title']}
-                    self._queue_drawing_message(matchup['challenger'], metadata)
-                    self._queue_drawing_message(matchup['champion'], metadata)
+                    drawings.append((matchup['challenger'], metadata))
+                    drawings.append((matchup['champion'], metadata))
+                filenames = self.render_drawings(
+                    [(self.normalize_drawing(drawing), self.image_filename(drawing)) for drawing, _ in drawings]
+                )
+
+                for (drawing, metadata), filename in zip(drawings, filenames):
+                    self._queue_drawing_message(drawing, metadata, filename)
 
                 # All messages prepared successfully, send them
                 self.send_queued_messages()
@@ -0,0 +1,85 @@
+"""Fakes for running games against Slack without a network."""
+import json
+import threading
+
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from jackbox import Jackbox
+
+
+class FakeSlack:
+    """Slack client recording every call, answering like the Web API.
+
+    Args:
+        fail: {method: n} - the n-th call (counting from 1) of a method raises internal_error
+    """
+
+    def __init__(self, fail: dict = None):
+        self.fail = dict(fail or {})
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _call(self, method: str, **kwargs) -> int:
+        with self._lock:
+            self.calls.append((method, kwargs))
+            count = sum(1 for called, _ in self.calls if called == method)
+        if self.fail.get(method) == count:
+            raise SlackApiError('internal_error', {'ok': False, 'error': 'internal_error'})
+        return count
+
+    def called(self, method: str) -> list:
+        """Return the arguments of every call of a method, in order."""
+        return [kwargs for called, kwargs in self.calls if called == method]
+
+    def chat_postMessage(self, **kwargs):  # pylint: disable=invalid-name
+        return {'ok': True, 'ts': f"{self._call('chat.postMessage', **kwargs)}.0"}
+
+    def files_getUploadURLExternal(self, **kwargs):  # pylint: disable=invalid-name
+        number = self._call('files.getUploadURLExternal', **kwargs)
+        return {'ok': True, 'upload_url': f"https://files.example/upload/{number}", 'file_id': f"F{number}"}
+
+    def files_completeUploadExternal(self, **kwargs):  # pylint: disable=invalid-name
+        self._call('files.completeUploadExternal', **kwargs)
+        return {'ok': True, 'files': kwargs['files']}
+
+
+class FakeResponse:
+    status_code = 200
+    text = ''
+
+
+class FakeHttp:
+    """HttpClient stand-in accepting every upload."""
+
+    def post(self, url, data=None):  # pylint: disable=unused-argument
+        return FakeResponse()
+
+
+@pytest.fixture
+def make_game(tmp_path, monkeypatch):
+    """Return a factory for Jackbox instances posting to a FakeSlack, with a journal under tmp_path.
+
+    Instances made by one test share the account, so a second one resumes what the first delivered.
+    """
+    monkeypatch.setattr(Jackbox, '_shared', {})
+    config_file = tmp_path / 'config.json'
+    work_dir = tmp_path / 'work'
+    work_dir.mkdir()
+
+    def make(slack: FakeSlack, game_id: str = '1234', **config) -> Jackbox:
+        config = {
+            'slack_token': 'xoxb-test',
+            'slack_channel_id': 'C1',
+            'cache_dir': str(tmp_path / 'cache'),
+            **config,
+        }
+        config_file.write_text(json.dumps({'test': config}), encoding='utf-8')
+        monkeypatch.setenv('JACKBOT_CONFIG', str(config_file))
+        game = Jackbox(game_id, api_account='test', work_dir=str(work_dir))
+        game.data_url = 'TestGame'
+        game.gallery_url = 'TestGame'
+        game.slack_client = slack
+        game.http = FakeHttp()
+        return game
+    return make
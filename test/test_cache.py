@@ -0,0 +1,65 @@
+"""Tests for the size-bounded file cache."""
+import os
+
+from jackbox.core.cache import FileCache
+
+
+def write(path, size: int) -> str:
+    with open(path, 'wb') as file:
+        file.write(b'x' * size)
+    return str(path)
+
+
+def test_replacing_an_entry_counts_its_size_once(tmp_path):
+    cache = FileCache(str(tmp_path / 'cache'), max_bytes=25)
+    cache.put('aa01', write(tmp_path / 'a', 10))
+    cache.put('aa01', write(tmp_path / 'a', 12))
+    assert cache.size == 12
+
+    cache.put('bb02', write(tmp_path / 'b', 10))
+    assert cache.size == 22
+    assert os.path.exists(cache.path('aa01'))
+    assert os.path.exists(cache.path('bb02'))
+
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = FileCache(str(tmp_path / 'cache'), max_bytes=30)
+    for key in ('aa01', 'bb02', 'cc03'):
+        cache.put(key, write(tmp_path / key, 10))
+    # Reading aa01 makes bb02 the least recently used entry
+    assert cache.get('aa01', str(tmp_path / 'out'))
+
+    cache.put('dd04', write(tmp_path / 'dd04', 10))
+    assert not os.path.exists(cache.path('bb02'))
+    assert [key for key in ('aa01', 'cc03', 'dd04') if os.path.exists(cache.path(key))] == ['aa01', 'cc03', 'dd04']
+    assert cache.size == 30
+
+    cache.put('ee05', write(tmp_path / 'ee05', 15))
+    assert not os.path.exists(cache.path('cc03'))
+    assert not os.path.exists(cache.path('aa01'))
+    assert cache.size == 25
+
+
+def test_reopened_cache_orders_entries_by_access_time(tmp_path):
+    directory = str(tmp_path / 'cache')
+    cache = FileCache(directory, max_bytes=100)
+    for key in ('aa01', 'bb02', 'cc03'):
+        cache.put(key, write(tmp_path / key, 10))
+    for age, key in enumerate(('bb02', 'cc03', 'aa01')):
+        os.utime(cache.path(key), (1000 + age, 1000 + age))
+
+    reopened = FileCache(directory, max_bytes=20)
+    assert reopened.size == 30
+    reopened.put('dd04', write(tmp_path / 'dd04', 10))
+    assert [key for key in ('aa01', 'bb02', 'cc03', 'dd04') if os.path.exists(reopened.path(key))] == ['aa01', 'dd04']
+    assert reopened.size == 20
+
+
+def test_get_counts_hits_and_misses(tmp_path):
+    cache = FileCache(str(tmp_path / 'cache'), max_bytes=100)
+    cache.put('aa01', write(tmp_path / 'a', 10))
+    assert cache.get('aa01', str(tmp_path / 'out'))
+    assert not cache.get('ff00', str(tmp_path / 'missing'))
+    assert (cache.hits, cache.misses) == (1, 1)
+    with open(tmp_path / 'out', 'rb') as file:
+        assert file.read() == b'x' * 10
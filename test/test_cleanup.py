@@ -0,0 +1,95 @@
+"""Tests for deleting the bot's messages with their threads and files."""
+import threading
+
+from slack_sdk.errors import SlackApiError
+
+from jackbox.core.cleanup import BulkDeleter
+
+BOT = 'UBOT'
+
+
+class FakeChannel:
+    """Slack client over one channel of threads: {parent ts: [messages, parent first]}."""
+
+    def __init__(self, threads: dict):
+        self.threads = threads
+        self.read = []
+        self.deleted = []
+        self.deleted_files = []
+        self._lock = threading.Lock()
+
+    def _find(self, ts: str) -> dict:
+        return next(message for thread in self.threads.values() for message in thread if message['ts'] == ts)
+
+    def conversations_replies(self, channel, ts, limit, cursor=None):  # pylint: disable=unused-argument
+        with self._lock:
+            self.read.append(ts)
+        thread = self.threads.get(ts) or next(thread for thread in self.threads.values()
+                                              if ts in [message['ts'] for message in thread])
+        return {'messages': thread, 'response_metadata': {'next_cursor': ''}}
+
+    def chat_delete(self, channel, ts):  # pylint: disable=unused-argument
+        if self._find(ts).get('user') != BOT:
+            raise SlackApiError('cant_delete_message', {'ok': False, 'error': 'cant_delete_message'})
+        with self._lock:
+            self.deleted.append(ts)
+
+    def files_delete(self, file):
+        with self._lock:
+            self.deleted_files.append(file)
+
+
+def summary(message: dict, thread_ts: str = None) -> dict:
+    """Summarize a message like Jackbox.iter_bot_messages does."""
+    return {
+        'ts': message['ts'],
+        'thread_ts': thread_ts,
+        'reply_count': message.get('reply_count', 0),
+        'file_ids': [file['id'] for file in message.get('files', [])],
+    }
+
+
+def channel() -> FakeChannel:
+    return FakeChannel({
+        '1.0': [
+            {'ts': '1.0', 'user': BOT, 'reply_count': 3},
+            {'ts': '1.1', 'user': BOT, 'files': [{'id': 'F1'}, {'id': 'F2'}]},
+            {'ts': '1.2', 'user': 'UOTHER', 'files': [{'id': 'F3'}]},
+            {'ts': '1.3', 'user': BOT, 'files': [{'id': 'F4'}]},
+        ],
+        '2.0': [{'ts': '2.0', 'user': BOT, 'files': [{'id': 'F5'}]}],
+        '3.0': [{'ts': '3.0', 'user': 'UOTHER'}],
+    })
+
+
+def test_other_users_replies_and_files_are_left_alone():
+    slack = channel()
+    progress = BulkDeleter(slack, 'C1', user=BOT).delete(['1.0'])
+    assert sorted(slack.deleted) == ['1.0', '1.1', '1.3']
+    assert sorted(slack.deleted_files) == ['F1', 'F2', 'F4']
+    assert (progress.deleted, progress.skipped, progress.failed) == (6, 0, 0)
+
+
+def test_messages_the_bot_cannot_delete_are_skipped():
+    slack = channel()
+    progress = BulkDeleter(slack, 'C1', user=BOT).delete(['2.0', '3.0'])
+    assert sorted(slack.deleted) == ['2.0']
+    assert (progress.deleted, progress.skipped, progress.failed) == (2, 1, 0)
+
+
+def test_only_threads_with_replies_are_read():
+    slack = channel()
+    messages = [summary(slack.threads['1.0'][0]), summary(slack.threads['2.0'][0]),
+                summary(slack.threads['1.0'][1], thread_ts='1.0')]
+    progress = BulkDeleter(slack, 'C1', user=BOT).delete(messages)
+    assert slack.read == ['1.0']
+    assert sorted(slack.deleted) == ['1.0', '1.1', '1.3', '2.0']
+    assert sorted(slack.deleted_files) == ['F1', 'F2', 'F4', 'F5']
+    assert progress.failed == 0
+
+
+def test_replies_are_deleted_before_their_parent():
+    slack = channel()
+    replies, files = BulkDeleter(slack, 'C1', user=BOT).expand(['1.0'])
+    assert replies == ['1.1', '1.3', '1.0']
+    assert files == ['F1', 'F2', 'F4']
@@ -0,0 +1,64 @@
+"""Tests for parsing artifact drawings and their cache keys; these do not need cairo."""
+import json
+import os
+from array import array
+
+from jackbox.core.render import Drawing
+from jackbox.worldchampions import Worldchampions
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+
+LINES = [
+    {'color': '#000000', 'thickness': 6, 'points': [{'x': 20, 'y': 30}, {'x': 120, 'y': 90}]},
+    {'color': '#ff0000', 'thickness': 3, 'points': []},
+    {'color': '#3366CC', 'thickness': 4, 'points': [{'x': 100, 'y': 150}]},
+]
+
+
+def test_parse_points_reads_strings_and_point_dicts_alike():
+    expected = array('d', [440, 94, 438, 95.5])
+    assert Drawing.parse_points("440,94|438,95.5") == expected
+    assert Drawing.parse_points([{'x': 440, 'y': 94}, {'x': 438, 'y': 95.5}]) == expected
+    assert not Drawing.parse_points([])
+
+
+def test_from_lines_drops_empty_lines_and_scales_lines_but_not_dots():
+    drawing = Drawing.from_lines(LINES, size=(240, 320), background='#FFDD33', line_scale=5)
+    assert drawing.size == (240, 320)
+    assert drawing.background == '#FFDD33'
+    assert [(color, width, list(coords)) for color, width, coords in drawing.strokes] == [
+        ('#000000', 30, [20, 30, 120, 90]),
+        ('#3366CC', 4, [100, 150]),
+    ]
+
+
+def test_worldchampions_drawings_keep_every_point():
+    with open(os.path.join(FIXTURES, 'worldchampions.json'), encoding='utf-8') as file:
+        data = json.load(file)
+    raw = data['blob']['matchups'][0]['challenger']
+    drawing = Worldchampions.normalize_drawing(raw)
+    assert drawing.size == (raw['size']['width'], raw['size']['height'])
+    lines = [line for line in raw['lines'] if line['points']]
+    assert len(drawing.strokes) == len(lines)
+    for line, (color, _, coords) in zip(lines, drawing.strokes):
+        assert color == line['color']
+        assert len(coords) == 2 * len(line['points'].split('|'))
+
+
+def test_cache_key_changes_with_everything_that_affects_the_output():
+    key = Drawing.from_lines(LINES, size=(240, 320)).cache_key('svg')
+    assert Drawing.from_lines(LINES, size=(240, 320)).cache_key('svg') == key
+
+    moved = [dict(LINES[0], points=[{'x': 20, 'y': 31}, {'x': 120, 'y': 90}]), *LINES[1:]]
+    recolored = [dict(LINES[0], color='#000001'), *LINES[1:]]
+    thicker = [dict(LINES[0], thickness=7), *LINES[1:]]
+    variants = [
+        Drawing.from_lines(LINES, size=(240, 320)).cache_key('cairo'),
+        Drawing.from_lines(LINES, size=(320, 240)).cache_key('svg'),
+        Drawing.from_lines(LINES, size=(240, 320), background='#FFDD33').cache_key('svg'),
+        Drawing.from_lines(LINES, size=(240, 320), line_scale=2).cache_key('svg'),
+        Drawing.from_lines(moved, size=(240, 320)).cache_key('svg'),
+        Drawing.from_lines(recolored, size=(240, 320)).cache_key('svg'),
+        Drawing.from_lines(thicker, size=(240, 320)).cache_key('svg'),
+    ]
+    assert len({key, *variants}) == len(variants) + 1
@@ -0,0 +1,66 @@
+"""Tests for the delivery journal and resuming a game that failed halfway."""
+from jackbox.core.journal import DeliveryJournal
+
+from conftest import FakeSlack
+
+FILES = {'one.gif': 'One', 'two.gif': 'Two', 'three.gif': 'Three'}
+
+
+def queue_game(game, work_dir):
+    game.queue_intro_message()
+    for name, title in FILES.items():
+        (work_dir / name).write_bytes(b'GIF89a')
+        game.queue_file_upload(name, title, initial_comment=f"*{title}*")
+    game.queue_chat_message("Final scores")
+
+
+def test_forget_thread_clears_the_deliveries_of_that_game(tmp_path):
+    journal = DeliveryJournal(str(tmp_path / 'journal.sqlite'))
+    journal.record('TestGame/1', 'C1', '0:intro', 'intro_message', ts='100.0')
+    journal.record('TestGame/1', 'C1', '1:file', 'file_upload', file='one.gif')
+    journal.record('TestGame/2', 'C1', '0:intro', 'intro_message', ts='200.0')
+    journal.record('TestGame/2', 'C1', '1:file', 'file_upload', file='one.gif')
+
+    # A reply in the thread is not an intro message, so nothing is forgotten
+    assert not journal.forget_thread('C1', '101.0')
+    assert not journal.forget_thread('C2', '100.0')
+    assert journal.forget_thread('C1', '100.0') == ['TestGame/1']
+
+    assert not journal.delivered('TestGame/1', 'C1')
+    assert set(journal.delivered('TestGame/2', 'C1')) == {'0:intro', '1:file'}
+    journal.close()
+
+
+def test_rerun_sends_only_the_missing_messages(make_game, tmp_path):
+    work_dir = tmp_path / 'work'
+    failing = FakeSlack(fail={'files.completeUploadExternal': 2})
+    game = make_game(failing, slack_upload_batch_size=1)
+    queue_game(game, work_dir)
+    assert not game.send_queued_messages()
+    assert len(failing.called('chat.postMessage')) == 1
+    assert len(failing.called('files.completeUploadExternal')) == 2
+
+    slack = FakeSlack()
+    game = make_game(slack)
+    queue_game(game, work_dir)
+    assert game.send_queued_messages()
+
+    # The intro and the first file were delivered by the first run; the rest goes into its thread
+    completed = slack.called('files.completeUploadExternal')
+    assert [call['files'][0]['title'] for call in completed] == ['Two', 'Three']
+    assert {call['thread_ts'] for call in completed} == {'1.0'}
+    messages = slack.called('chat.postMessage')
+    assert [(message['text'], message['thread_ts']) for message in messages] == [("Final scores", '1.0')]
+    assert game.sent_messages == 3
+
+
+def test_rerun_after_success_sends_nothing(make_game, tmp_path):
+    game = make_game(FakeSlack())
+    queue_game(game, tmp_path / 'work')
+    assert game.send_queued_messages()
+
+    slack = FakeSlack()
+    game = make_game(slack)
+    queue_game(game, tmp_path / 'work')
+    assert game.send_queued_messages()
+    assert not slack.calls
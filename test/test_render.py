@@ -0,0 +1,77 @@
+"""Pixel comparison of the cairo render backend against the svg reference backend."""
+import json
+import os
+from array import array
+
+import pytest
+
+from jackbox.core.render import Drawing, get_renderer
+from jackbox.worldchampions import Worldchampions
+
+try:
+    import cairocffi
+    import cairosvg  # noqa: F401  pylint: disable=unused-import
+except (ImportError, OSError) as ex:
+    # CI sets JACKBOT_REQUIRE_CAIRO so a missing libcairo fails the run instead of skipping the comparison
+    if os.environ.get('JACKBOT_REQUIRE_CAIRO'):
+        raise
+    pytest.skip(f"cairo is not available: {ex}", allow_module_level=True)
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+
+# Largest difference allowed in any channel of a pixel before it counts as differing
+CHANNEL_TOLERANCE = 16
+# Share of pixels allowed to differ; both backends rasterize with cairo, so only a few antialiased
+# edge pixels may come out differently
+DIFFERING_PIXELS = 0.002
+
+
+def worldchampions_drawings():
+    with open(os.path.join(FIXTURES, 'worldchampions.json'), encoding='utf-8') as file:
+        data = json.load(file)
+    for matchup in data['blob']['matchups']:
+        for side in ('challenger', 'champion'):
+            yield f"worldchampions-{matchup['matchupID']}-{side}", Worldchampions.normalize_drawing(matchup[side])
+
+
+def point_drawings():
+    """Drawings with {'x', 'y'} points, as Tee K.O. and Drawful store them."""
+    lines = [
+        {'color': '#000000', 'thickness': 6, 'points': [{'x': 20, 'y': 30}, {'x': 120, 'y': 90}, {'x': 200, 'y': 40}]},
+        {'color': '#ff0000', 'thickness': 3, 'points': [{'x': 60, 'y': 200}, {'x': 60, 'y': 280}, {'x': 150, 'y': 280},
+                                                        {'x': 150, 'y': 200}]},
+        {'color': '#3366CC', 'thickness': 4, 'points': [{'x': 100, 'y': 150}]},
+    ]
+    yield 'teeko', Drawing.from_lines(lines, size=(300, 300), background='#FFDD33')
+    yield 'drawful', Drawing.from_lines(lines, size=(240, 320))
+
+
+DRAWINGS = [*worldchampions_drawings(), *point_drawings()]
+
+
+def pixels(filename: str) -> tuple:
+    surface = cairocffi.ImageSurface.create_from_png(filename)
+    size = surface.get_width(), surface.get_height()
+    data = array('B', bytes(surface.get_data()))
+    surface.finish()
+    return size, data
+
+
+@pytest.mark.parametrize('drawing', [drawing for _, drawing in DRAWINGS], ids=[name for name, _ in DRAWINGS])
+def test_cairo_matches_svg(drawing, tmp_path):
+    svg_file = str(tmp_path / 'svg.png')
+    cairo_file = str(tmp_path / 'cairo.png')
+    get_renderer('svg').render(drawing, svg_file)
+    get_renderer('cairo').render(drawing, cairo_file)
+
+    svg_size, svg_pixels = pixels(svg_file)
+    cairo_size, cairo_pixels = pixels(cairo_file)
+    assert cairo_size == svg_size
+
+    differing = sum(
+        1 for position in range(0, len(svg_pixels), 4)
+        if max(abs(svg_pixels[position + channel] - cairo_pixels[position + channel]) for channel in range(4))
+        > CHANNEL_TOLERANCE
+    )
+    total = svg_size[0] * svg_size[1]
+    assert differing <= total * DIFFERING_PIXELS, f"{differing} of {total} pixels differ"
@@ -0,0 +1,124 @@
+"""Tests for the HTTP retry policy, run against a fake clock."""
+import pytest
+import requests
+
+from jackbox.core.retry import RetryPolicy
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the policy sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ''
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def policy(**kwargs) -> tuple:
+    retry_policy = RetryPolicy(jitter=0.0, **kwargs)
+    clock = FakeClock()
+    retry_policy.clock = clock
+    retry_policy.sleep = clock.sleep
+    return retry_policy, clock
+
+
+def responses(*items):
+    """Return a request callable answering with the given responses or raising the given exceptions."""
+    items = list(items)
+
+    def request():
+        item = items.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+    return request
+
+
+def test_backoff_grows_exponentially_up_to_max_delay():
+    retry_policy, _ = policy(base_delay=1.0, multiplier=2.0, max_delay=5.0)
+    assert [retry_policy.backoff(attempt) for attempt in range(1, 5)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_retries_transient_statuses_with_backoff():
+    retry_policy, clock = policy(base_delay=1.0)
+    failed = FakeResponse(503)
+    response = retry_policy.run(responses(failed, FakeResponse(502), FakeResponse(200)), 'test')
+    assert response.status_code == 200
+    assert clock.sleeps == [1.0, 2.0]
+    assert failed.closed
+
+
+def test_retry_after_header_replaces_backoff():
+    retry_policy, clock = policy(base_delay=1.0)
+    response = retry_policy.run(
+        responses(FakeResponse(429, {'Retry-After': '7'}), FakeResponse(503), FakeResponse(200)), 'test'
+    )
+    assert response.status_code == 200
+    assert clock.sleeps == [7.0, 2.0]
+
+
+def test_gives_up_when_the_next_attempt_would_pass_the_deadline():
+    retry_policy, clock = policy(base_delay=2.0, deadline=5.0)
+    response = retry_policy.run(responses(FakeResponse(503), FakeResponse(503), FakeResponse(200)), 'test')
+    # 2s after the first attempt, waiting another 4s would end past the 5s deadline
+    assert response.status_code == 503
+    assert clock.sleeps == [2.0]
+
+
+def test_retry_after_past_the_deadline_gives_up_immediately():
+    retry_policy, clock = policy(deadline=10.0)
+    response = retry_policy.run(responses(FakeResponse(429, {'Retry-After': '60'}), FakeResponse(200)), 'test')
+    assert response.status_code == 429
+    assert clock.sleeps == []
+
+
+def test_stops_after_max_attempts():
+    retry_policy, clock = policy(max_attempts=3, base_delay=0.5)
+    response = retry_policy.run(responses(*[FakeResponse(500)] * 3), 'test')
+    assert response.status_code == 500
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_other_statuses_are_not_retried():
+    retry_policy, clock = policy()
+    assert retry_policy.run(responses(FakeResponse(404)), 'test').status_code == 404
+    assert clock.sleeps == []
+
+
+def test_every_failure_is_retried_without_retry_statuses():
+    retry_policy, clock = policy(base_delay=1.0)
+    response = retry_policy.run(responses(FakeResponse(404), FakeResponse(200)), 'test', retry_statuses=None)
+    assert response.status_code == 200
+    assert clock.sleeps == [1.0]
+
+
+def test_connection_errors_are_retried_then_raised():
+    retry_policy, clock = policy(max_attempts=2, base_delay=1.0)
+    with pytest.raises(requests.ConnectionError):
+        retry_policy.run(responses(requests.ConnectionError('refused'), requests.ConnectionError('refused')), 'test')
+    assert clock.sleeps == [1.0]
+
+
+def test_retry_after_parses_seconds_and_ignores_garbage():
+    assert RetryPolicy.retry_after(FakeResponse(429, {'Retry-After': '3'})) == 3.0
+    assert RetryPolicy.retry_after(FakeResponse(429, {'Retry-After': '-3'})) == 0.0
+    assert RetryPolicy.retry_after(FakeResponse(429, {'Retry-After': 'soon'})) is None
+    assert RetryPolicy.retry_after(FakeResponse(429)) is None
+    assert RetryPolicy.retry_after(None) is None
@@ -0,0 +1,66 @@
+"""Tests for sending a game's queued messages to Slack."""
+from conftest import FakeSlack
+
+
+def queue_game(game, work_dir, comments: bool = True, files: int = 3):
+    game.queue_intro_message()
+    for number in range(1, files + 1):
+        (work_dir / f"{number}.gif").write_bytes(b'GIF89a')
+        game.queue_file_upload(f"{number}.gif", f"Drawing {number}",
+                               initial_comment=f"*Drawing {number}*" if comments else None)
+    game.queue_chat_message("Final scores")
+
+
+def test_intro_is_posted_before_any_upload(make_game, tmp_path):
+    slack = FakeSlack()
+    game = make_game(slack)
+    queue_game(game, tmp_path / 'work')
+    assert game.send_queued_messages()
+    assert slack.calls[0][0] == 'chat.postMessage'
+    assert 'thread_ts' not in slack.calls[0][1]
+
+
+def test_failed_intro_uploads_nothing(make_game, tmp_path):
+    slack = FakeSlack(fail={'chat.postMessage': 1})
+    game = make_game(slack)
+    queue_game(game, tmp_path / 'work')
+    assert not game.send_queued_messages()
+    assert [method for method, _ in slack.calls] == ['chat.postMessage']
+    assert not list((tmp_path / 'work').iterdir())
+
+
+def test_commented_files_are_shared_in_batches(make_game, tmp_path):
+    slack = FakeSlack()
+    game = make_game(slack)
+    queue_game(game, tmp_path / 'work', files=12)
+    assert game.send_queued_messages()
+
+    completed = slack.called('files.completeUploadExternal')
+    assert [len(call['files']) for call in completed] == [10, 2]
+    assert completed[1]['initial_comment'] == "*Drawing 11*\n\n*Drawing 12*"
+    assert {call['thread_ts'] for call in completed} == {'1.0'}
+    assert len(slack.called('files.getUploadURLExternal')) == 12
+    assert game.sent_messages == 14
+
+
+def test_files_without_comments_share_a_message_without_comment(make_game, tmp_path):
+    slack = FakeSlack()
+    game = make_game(slack)
+    queue_game(game, tmp_path / 'work', comments=False)
+    assert game.send_queued_messages()
+
+    completed = slack.called('files.completeUploadExternal')
+    assert [[file['title'] for file in call['files']] for call in completed] == [['Drawing 1', 'Drawing 2', 'Drawing 3']]
+    assert 'initial_comment' not in completed[0]
+
+
+def test_batch_size_one_keeps_every_comment_with_its_file(make_game, tmp_path):
+    slack = FakeSlack()
+    game = make_game(slack, slack_upload_batch_size=1)
+    queue_game(game, tmp_path / 'work')
+    assert game.send_queued_messages()
+
+    completed = slack.called('files.completeUploadExternal')
+    assert [(call['files'][0]['title'], call['initial_comment']) for call in completed] == [
+        ('Drawing 1', '*Drawing 1*'), ('Drawing 2', '*Drawing 2*'), ('Drawing 3', '*Drawing 3*')
+    ]
@@ -0,0 +1,134 @@
+"""Tests for the Slack call pacing, run against a fake clock."""
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from jackbox.core.slack import SlackDispatcher, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to, or when advance_on_sleep is set and a caller sleeps."""
+
+    def __init__(self, advance_on_sleep: bool = True):
+        self.now = 0.0
+        self.sleeps = []
+        self.advance_on_sleep = advance_on_sleep
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        if self.advance_on_sleep:
+            self.now += seconds
+
+
+class FakeSlackResponse(dict):
+    def __init__(self, error: str, headers: dict = None):
+        super().__init__(ok=False, error=error)
+        self.headers = headers or {}
+
+
+class FakeClient:
+    """Answers chat_postMessage with the given results in turn, raising the exceptions among them."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.posted = []
+
+    def chat_postMessage(self, **kwargs):  # pylint: disable=invalid-name
+        self.posted.append(kwargs)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def users_info(self, **kwargs):
+        return {'ok': True, **kwargs}
+
+
+def rate_limited(retry_after: str = None) -> SlackApiError:
+    headers = {'Retry-After': retry_after} if retry_after is not None else {}
+    return SlackApiError('ratelimited', FakeSlackResponse('ratelimited', headers))
+
+
+def dispatcher(client, **kwargs) -> tuple:
+    slack = SlackDispatcher(client, **kwargs)
+    clock = FakeClock()
+    slack.clock = clock
+    slack.sleep = clock.sleep
+    return slack, clock
+
+
+def test_bucket_allows_a_burst_then_paces_queued_callers():
+    # Callers arriving at the same moment: the clock does not move while they wait
+    clock = FakeClock(advance_on_sleep=False)
+    bucket = TokenBucket(60, burst=2, clock=clock)
+    bucket.sleep = clock.sleep
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+    assert clock.sleeps == [1.0, 2.0]
+
+
+def test_bucket_refills_after_idle_up_to_its_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(120, burst=3, clock=clock)
+    bucket.sleep = clock.sleep
+    for _ in range(3):
+        bucket.acquire()
+    clock.now += 60
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.0, 0.5]
+
+
+def test_bucket_pause_holds_back_callers():
+    clock = FakeClock()
+    bucket = TokenBucket(60, burst=5, clock=clock)
+    bucket.sleep = clock.sleep
+    bucket.pause(7)
+    bucket.pause(3)
+    assert bucket.acquire() == 7.0
+    assert bucket.acquire() == 1.0
+
+
+def test_dispatcher_retries_rate_limited_calls_after_retry_after():
+    client = FakeClient(rate_limited('3'), rate_limited(), {'ok': True, 'ts': '1.0'})
+    slack, clock = dispatcher(client)
+    assert slack.chat_postMessage(channel='C1', text='hi') == {'ok': True, 'ts': '1.0'}
+    assert len(client.posted) == 3
+    assert slack.calls['chat.postMessage'] == 3
+    assert slack.rate_limited['chat.postMessage'] == 2
+    # Retry-After when Slack sends it, one second otherwise
+    assert clock.sleeps == [3.0, 1.0]
+    assert slack.wait_seconds == 4.0
+
+
+def test_dispatcher_gives_up_after_max_retries():
+    client = FakeClient(*[rate_limited('2')] * 3)
+    slack, clock = dispatcher(client, max_retries=2)
+    with pytest.raises(SlackApiError):
+        slack.chat_postMessage(channel='C1', text='hi')
+    assert len(client.posted) == 3
+    assert clock.sleeps == [2.0, 2.0]
+
+
+def test_dispatcher_does_not_retry_other_errors():
+    client = FakeClient(SlackApiError('not_in_channel', FakeSlackResponse('not_in_channel')))
+    slack, clock = dispatcher(client)
+    with pytest.raises(SlackApiError):
+        slack.chat_postMessage(channel='C1', text='hi')
+    assert slack.rate_limited['chat.postMessage'] == 0
+    assert not clock.sleeps
+
+
+def test_dispatcher_paces_messages_per_channel():
+    client = FakeClient(*[{'ok': True}] * 4)
+    slack, clock = dispatcher(client, config={'slack_rate_limits': {'special': 10}})
+    clock.advance_on_sleep = False
+    for channel in ('C1', 'C1', 'C2', 'C1'):
+        slack.chat_postMessage(channel=channel, text='hi')
+    # Ten calls a minute allow a burst of one; C2 has a bucket of its own
+    assert clock.sleeps == [6.0, 12.0]
+
+
+def test_dispatcher_passes_untracked_methods_through():
+    slack, _ = dispatcher(FakeClient())
+    assert slack.users_info(user='U1') == {'ok': True, 'user': 'U1'}
+    assert not slack.calls
@@ -0,0 +1,40 @@
+"""Tests for the watch mode sources."""
+import os
+import threading
+
+from jackbox.core.watch import DirectoryWatcher, SubmissionQueue, parse_urls
+
+
+def test_parse_urls_skips_blank_lines_and_comments():
+    assert parse_urls("# games\nhttps://a/b/1\n\n  https://a/b/2  \n") == ['https://a/b/1', 'https://a/b/2']
+
+
+def test_submission_queue_ignores_urls_in_progress():
+    submissions = SubmissionQueue()
+    assert submissions.submit('https://a/b/1')
+    assert not submissions.submit('https://a/b/1')
+    assert submissions.get(timeout=0) == 'https://a/b/1'
+    assert not submissions.submit('https://a/b/1')
+    submissions.done('https://a/b/1')
+    assert submissions.submit('https://a/b/1')
+
+
+def test_directory_watcher_submits_and_stops(tmp_path):
+    submitted = []
+    received = threading.Event()
+
+    def submit(url):
+        submitted.append(url)
+        received.set()
+
+    (tmp_path / 'games.txt').write_text("https://a/DrawfulGame/1\n", encoding='utf-8')
+    os.utime(tmp_path / 'games.txt', (0, 0))
+    watcher = DirectoryWatcher(str(tmp_path), submit, interval=0.05, settle=0)
+    watcher.start()
+    assert received.wait(5)
+    watcher.stop()
+    watcher.join(5)
+
+    assert not watcher.is_alive()
+    assert submitted == ['https://a/DrawfulGame/1']
+    assert os.listdir(tmp_path / 'processed') == ['games.txt']